@@ -0,0 +1,98 @@
+"""Cache codec - self-describing cache entries, shared by the cache adapters.
+
+An entry starts with a single header line followed by the (possibly compressed) body:
+
+    \\x00SC2 <written> <ttl> <grace> <content type> <encoding>\\n<body>
+
+The write time is a fixed-width timestamp at a fixed offset, so it can be refreshed in
+place. Plain text entries written by older versions carry no header and are still decoded.
+"""
+import time
+import zlib
+from collections import namedtuple
+
+MAGIC = b"\x00SC2 "
+HEADER_SIZE = 128  # Upper bound of a header line, enough to decide freshness
+WRITTEN_OFFSET = len(MAGIC)
+WRITTEN_SIZE = 10
+
+NO_TTL = "-"
+ENCODING_IDENTITY = "identity"
+ENCODING_ZLIB = "zlib"
+
+compress_threshold = 1024  # Smaller entries are stored uncompressed
+compress_level = 6
+
+EntryHeader = namedtuple(
+    "EntryHeader", ["written", "ttl", "grace", "content_type", "encoding", "size"]
+)
+
+
+def encode(data: str, ttl: int = None, content_type: str = "application/json",
+           written: int = None, grace: int = 0) -> bytes:
+    """
+    Encode a cache entry, compressing it if it is big enough.
+    :param ttl: Time to live in minutes, None if the entry does not expire
+    :param grace: Minutes the entry is kept after it expired
+    """
+    body = data.encode("utf-8")
+    encoding = ENCODING_IDENTITY
+    if len(body) >= compress_threshold:
+        body = zlib.compress(body, compress_level)
+        encoding = ENCODING_ZLIB
+
+    header = "{} {} {} {} {}\n".format(
+        encode_written(written).decode(),
+        NO_TTL if ttl is None else int(ttl),
+        int(grace),
+        content_type,
+        encoding
+    )
+    return MAGIC + header.encode() + body
+
+
+def encode_written(written: int = None) -> bytes:
+    """Encode a write time for the fixed-width field at WRITTEN_OFFSET."""
+    written = int(time.time()) if written is None else int(written)
+    return str(written).zfill(WRITTEN_SIZE).encode()
+
+
+def decode_header(blob):
+    """
+    Read the header of an entry, only the first HEADER_SIZE bytes are needed.
+    :return: EntryHeader or None for entries without header
+    """
+    if isinstance(blob, str) or not bytes(blob[:len(MAGIC)]) == MAGIC:
+        return None
+
+    blob = bytes(blob)
+    end = blob.find(b"\n")
+    if end < 0:
+        return None
+
+    written, ttl, grace, rest = blob[len(MAGIC):end].decode().split(" ", 3)
+    content_type, encoding = rest.rsplit(" ", 1)
+    return EntryHeader(
+        written=int(written),
+        ttl=None if ttl == NO_TTL else int(ttl),
+        grace=int(grace),
+        content_type=content_type,
+        encoding=encoding,
+        size=end + 1
+    )
+
+
+def decode(blob) -> str:
+    """Decode the body of an entry written by encode() or by an older version."""
+    if isinstance(blob, str):
+        return blob
+
+    blob = bytes(blob)
+    header = decode_header(blob)
+    if header:
+        body = blob[header.size:]
+        if header.encoding == ENCODING_ZLIB:
+            body = zlib.decompress(body)
+        return body.decode("utf-8")
+
+    return blob.decode("utf-8")
@@ -0,0 +1 @@
+# HTTP transport adapters
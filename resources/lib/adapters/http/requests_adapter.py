@@ -0,0 +1,56 @@
+"""Requests HTTP adapter - implements IHttpClient with a pooled keep-alive session."""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from resources.lib.ports.http import IHttpClient
+
+
+class RequestsHttpAdapter(IHttpClient):
+    """Requests implementation of the HTTP port backed by a single pooled session."""
+
+    pool_connections = 4  # Number of hosts to keep pools for
+    pool_maxsize = 8  # Connections per host, must cover concurrent workers
+    timeout_connect = 5  # seconds
+    timeout_read = 20  # seconds
+    retry_total = 2
+    retry_backoff_factor = 0.3
+    retry_status_forcelist = (429, 500, 502, 503, 504)
+
+    def __init__(self, pool_maxsize: int = None):
+        if pool_maxsize:
+            self.pool_maxsize = pool_maxsize
+
+        retry = Retry(
+            total=self.retry_total,
+            backoff_factor=self.retry_backoff_factor,
+            status_forcelist=self.retry_status_forcelist,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry
+        )
+
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def pool_size(self) -> int:
+        """Number of connections kept open per host."""
+        return self.pool_maxsize
+
+    def get(self, url: str, params=None, headers=None):
+        """Send a GET request over a pooled keep-alive connection."""
+        return self._session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=(self.timeout_connect, self.timeout_read)
+        )
+
+    def close(self) -> None:
+        """Release all pooled connections."""
+        self._session.close()
@@ -1,5 +1,7 @@
 """KODI cache adapter - implements ICache."""
 import time
+from typing import Callable, Optional
+from resources.lib.adapters import cache_codec
 from resources.lib.ports.cache import ICache
 from resources.lib.ports.filesystem import IFileSystem
 
@@ -7,32 +9,147 @@ from resources.lib.ports.filesystem import IFileSystem
 class KodiCacheAdapter(ICache):
     """KODI implementation of cache adapter."""
     
-    def __init__(self, settings, filesystem: IFileSystem):
+    legacy_ttl = 60  # Entries written without header used to be read with this age
+    
+    def __init__(self, settings, filesystem: IFileSystem, max_bytes: int = 0, pinned=()):
+        """
+        :param max_bytes: Byte budget of the cache directory (0 means unlimited)
+        :param pinned: Cache keys which are never evicted
+        """
         self._settings = settings
         self._filesystem = filesystem
+        self._max_bytes = max_bytes
+        self._pinned = set(pinned)
     
-    def get(self, filename: str, age: int = 60):
+    def get(self, filename: str, age: Optional[int] = None):
         """
         Get a cached file.
         :param filename: Cache key
-        :param age: Maximum age in minutes
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
         :return: Cached content or None if not found/expired
         """
-        file = self._filesystem.read(filename)
+        file, _ = self.get_stale(filename, age)
+        return file
+    
+    def get_stale(self, filename: str, age: Optional[int] = None, max_stale: int = 0):
+        """
+        Get a cached file, accepting entries that expired less than max_stale minutes ago.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :param max_stale: Maximum time in minutes an expired entry may still be served
+        :return: Tuple of cached content (None if not found/too old) and a stale flag
+        """
+        # Freshness is decided from the header, so expired bodies are never read
+        blob = self._filesystem.read_bytes(filename, cache_codec.HEADER_SIZE)
         
-        if file:
-            mtime = self._filesystem.get_mtime(filename)
-            if (int(time.time()) - age * 60) > mtime:
-                return None
+        if not blob:
+            return None, False
         
-        return file
+        header = cache_codec.decode_header(blob)
+        if header:
+            written, ttl = header.written, header.ttl
+        else:
+            written, ttl = self._filesystem.get_mtime(filename), self.legacy_ttl
+        
+        ttl = ttl if age is None else age
+        elapsed = int(time.time()) - written
+        if ttl is not None and elapsed > (ttl + max_stale) * 60:
+            return None, False
+        
+        if len(blob) == cache_codec.HEADER_SIZE:
+            blob = self._filesystem.read_bytes(filename)
+        
+        # Eviction must not depend on the mount options, so accesses are recorded explicitly
+        if self._max_bytes:
+            self._filesystem.set_atime(filename)
+        
+        return cache_codec.decode(blob), ttl is not None and elapsed > ttl * 60
     
-    def add(self, filename: str, data: str):
+    def add(self, filename: str, data: str, ttl: Optional[int] = None,
+            content_type: str = "application/json", grace: int = 0):
         """
         Add data to cache.
         :param filename: Cache key
         :param data: Data to cache
+        :param ttl: Time to live in minutes, None if the entry does not expire
+        :param content_type: Content type of the data
+        :param grace: Minutes the entry is kept after it expired, so it can still be served
+                      stale or revalidated
         :return: Filepath on success, None on failure
         """
-        return self._filesystem.write(filename, data)
-
+        return self._filesystem.write_bytes(
+            filename, cache_codec.encode(data, ttl, content_type, grace=grace)
+        )
+    
+    def touch(self, filename: str) -> bool:
+        """
+        Mark a cached file as fresh without rewriting its content.
+        :param filename: Cache key
+        :return: True on success
+        """
+        blob = self._filesystem.read_bytes(filename, cache_codec.HEADER_SIZE)
+        if blob and cache_codec.decode_header(blob):
+            return self._filesystem.write_bytes_at(
+                filename, cache_codec.WRITTEN_OFFSET, cache_codec.encode_written()
+            )
+        # Entries without header use the modification time
+        return self._filesystem.touch(filename)
+    
+    def clear(self) -> None:
+        """Delete all cached files."""
+        self._filesystem.destroy()
+    
+    def purge(self, throttle: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Delete files which expired longer than their grace period ago.
+        :param throttle: Called between two files, returning False stops the purge
+        :return: Number of deleted files
+        """
+        now = int(time.time())
+        purged = 0
+        
+        for filename in self._filesystem.list_files():
+            if throttle and not throttle():
+                break
+            
+            blob = self._filesystem.read_bytes(filename, cache_codec.HEADER_SIZE)
+            if not blob:
+                continue
+            
+            header = cache_codec.decode_header(blob)
+            if header:
+                written, ttl, grace = header.written, header.ttl, header.grace
+            else:
+                written, ttl, grace = self._filesystem.get_mtime(filename), self.legacy_ttl, 0
+            
+            if ttl is not None and now - written > (ttl + grace) * 60:
+                self._filesystem.delete(filename)
+                purged += 1
+        
+        return purged
+    
+    def compact(self) -> None:
+        """Enforce the byte budget, this scans all files and is left to the cache janitor."""
+        if self._max_bytes:
+            self._evict()
+    
+    def close(self) -> None:
+        """Nothing to release, files are only opened for a single operation."""
+        pass
+    
+    def _evict(self) -> None:
+        """Delete least recently used files until the cache fits into its byte budget."""
+        total = 0
+        candidates = []
+        for filename in self._filesystem.list_files():
+            size = self._filesystem.get_size(filename)
+            total += size
+            if filename not in self._pinned:
+                # Written files get a new access time, hits are recorded by get_stale()
+                candidates.append((self._filesystem.get_atime(filename), size, filename))
+        
+        for _, size, filename in sorted(candidates):
+            if total <= self._max_bytes:
+                break
+            self._filesystem.delete(filename)
+            total -= size
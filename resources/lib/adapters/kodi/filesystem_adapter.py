@@ -1,11 +1,16 @@
 """KODI file system adapter - implements IFileSystem using xbmcvfs."""
 import os
+import time
 import xbmcvfs
 from resources.lib.ports.filesystem import IFileSystem
 
 
 class KodiFileSystemAdapter(IFileSystem):
-    """KODI implementation of file system adapter."""
+    """
+    KODI implementation of file system adapter.
+    xbmcvfs cannot append, write at an offset or set file times, so those operations use
+    the os module; the profile directory they are used on is a local path.
+    """
     
     def __init__(self, root_path: str):
         self._root_path = root_path
@@ -26,6 +31,42 @@ class KodiFileSystemAdapter(IFileSystem):
         with xbmcvfs.File(filepath, "w") as file:
             return filepath if file.write(content) else None
     
+    def read_bytes(self, filename: str, size=None):
+        """Read a binary file and return its contents, or only its first size bytes."""
+        filepath = os.path.join(self._root_path, filename)
+        if xbmcvfs.exists(filepath):
+            with xbmcvfs.File(filepath) as file:
+                return bytes(file.readBytes(size or 0))
+        return None
+    
+    def write_bytes(self, filename: str, content: bytes):
+        """Write binary content to a file."""
+        filepath = os.path.join(self._root_path, filename)
+        with xbmcvfs.File(filepath, "w") as file:
+            return filepath if file.write(bytearray(content)) else None
+    
+    def write_bytes_at(self, filename: str, offset: int, content: bytes) -> bool:
+        """Overwrite part of an existing file, starting at offset."""
+        filepath = os.path.join(self._root_path, filename)
+        try:
+            with open(filepath, "r+b") as file:
+                file.seek(offset)
+                file.write(content)
+            return True
+        except OSError:
+            return False
+    
+    def append(self, filename: str, content: str) -> bool:
+        """Append content to a file, the file is created if it does not exist."""
+        filepath = os.path.join(self._root_path, filename)
+        try:
+            with open(filepath, "a", encoding="utf-8") as file:
+                file.write(content)
+            return True
+        except OSError:
+            # E.g. a path substituted profile, rewrite the whole file through xbmcvfs instead
+            return self.write(filename, (self.read(filename) or "") + content) is not None
+    
     def delete(self, filename: str) -> bool:
         """Delete a file."""
         filepath = os.path.join(self._root_path, filename)
@@ -41,6 +82,41 @@ class KodiFileSystemAdapter(IFileSystem):
         stat = xbmcvfs.Stat(filepath)
         return stat.st_mtime()
     
+    def get_atime(self, filename: str) -> int:
+        """Get the last access time of a file."""
+        filepath = os.path.join(self._root_path, filename)
+        stat = xbmcvfs.Stat(filepath)
+        return stat.st_atime()
+    
+    def set_atime(self, filename: str) -> bool:
+        """Set the access time of a file to now, keeping its modification time."""
+        filepath = os.path.join(self._root_path, filename)
+        try:
+            os.utime(filepath, (time.time(), os.stat(filepath).st_mtime))
+            return True
+        except OSError:
+            return False
+    
+    def get_size(self, filename: str) -> int:
+        """Get the size of a file in bytes."""
+        filepath = os.path.join(self._root_path, filename)
+        stat = xbmcvfs.Stat(filepath)
+        return stat.st_size()
+    
+    def list_files(self):
+        """List the names of all files in the file system root."""
+        _, file_list = xbmcvfs.listdir(self._root_path)
+        return file_list
+    
+    def touch(self, filename: str) -> bool:
+        """Set the modification time of a file to now."""
+        filepath = os.path.join(self._root_path, filename)
+        try:
+            os.utime(filepath, None)
+            return True
+        except OSError:
+            return False
+    
     def destroy(self) -> None:
         """Delete the entire file system root and all contents."""
         self._remove_dir(self._root_path)
@@ -0,0 +1,96 @@
+"""KODI metrics adapter - implements IMetrics with a JSON file in the addon profile."""
+import json
+import threading
+from typing import Any, Dict
+from resources.lib.ports.filesystem import IFileSystem
+from resources.lib.ports.metrics import IMetrics
+
+
+class KodiMetricsAdapter(IMetrics):
+    """
+    Collects metrics in memory and merges them into a JSON file on flush,
+    so numbers accumulate across plugin invocations.
+    """
+
+    filename = "metrics.json"
+    buckets = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)  # Upper bounds of histogram buckets
+    
+    def __init__(self, filesystem: IFileSystem, enabled: bool = True):
+        self._filesystem = filesystem
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._pending = self._empty()
+    
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increase a counter."""
+        if not self._enabled:
+            return
+        with self._lock:
+            counters = self._pending["counters"]
+            counters[name] = counters.get(name, 0) + value
+    
+    def observe(self, name: str, value: float) -> None:
+        """Record a value in a histogram."""
+        if not self._enabled:
+            return
+        bucket = next((str(bound) for bound in self.buckets if value <= bound), "inf")
+        with self._lock:
+            histogram = self._pending["histograms"].setdefault(name, self._empty_histogram())
+            histogram["count"] += 1
+            histogram["sum"] += value
+            histogram["buckets"][bucket] = histogram["buckets"].get(bucket, 0) + 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all persisted and pending metrics."""
+        with self._lock:
+            return self._merge(self._load(), self._pending)
+    
+    def pending(self) -> Dict[str, Any]:
+        """Return a copy of the metrics collected since the last flush."""
+        with self._lock:
+            return self._merge(self._empty(), self._pending)
+    
+    def flush(self) -> None:
+        """Merge pending metrics into the metrics file."""
+        with self._lock:
+            if not self._pending["counters"] and not self._pending["histograms"]:
+                return
+            merged = self._merge(self._load(), self._pending)
+            self._filesystem.write(self.filename, json.dumps(merged))
+            self._pending = self._empty()
+    
+    def reset(self) -> None:
+        """Discard pending and persisted metrics."""
+        with self._lock:
+            self._pending = self._empty()
+            self._filesystem.delete(self.filename)
+    
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self._filesystem.read(self.filename) or "{}")
+        except ValueError:
+            data = {}
+        return {
+            "counters": data.get("counters", {}),
+            "histograms": data.get("histograms", {}),
+        }
+    
+    @staticmethod
+    def _merge(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+        for name, value in source["counters"].items():
+            target["counters"][name] = target["counters"].get(name, 0) + value
+        for name, histogram in source["histograms"].items():
+            merged = target["histograms"].setdefault(name, KodiMetricsAdapter._empty_histogram())
+            merged["count"] += histogram["count"]
+            merged["sum"] += histogram["sum"]
+            for bucket, count in histogram["buckets"].items():
+                merged["buckets"][bucket] = merged["buckets"].get(bucket, 0) + count
+        return target
+    
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {"counters": {}, "histograms": {}}
+    
+    @staticmethod
+    def _empty_histogram() -> Dict[str, Any]:
+        return {"count": 0, "sum": 0, "buckets": {}}
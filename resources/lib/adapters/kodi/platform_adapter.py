@@ -80,6 +80,11 @@ class KodiPlatformAdapter(IPlatformAdapter):
         dialog = xbmcgui.Dialog()
         dialog.ok(heading, message)
     
+    def show_text_dialog(self, heading: str, text: str) -> None:
+        """Show a scrollable text dialog."""
+        dialog = xbmcgui.Dialog()
+        dialog.textviewer(heading, text)
+    
     def input_dialog(self, heading: str):
         """Show an input dialog and return the entered text."""
         dialog = xbmcgui.Dialog()
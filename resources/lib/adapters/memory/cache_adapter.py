@@ -0,0 +1,122 @@
+"""Memory cache adapter - in-process tier in front of another ICache."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from resources.lib.ports.cache import ICache
+
+
+class MemoryCacheAdapter(ICache):
+    """Keeps recently used entries in memory, so repeated lookups skip the backing cache."""
+
+    def __init__(self, cache: ICache, max_entries: int = 128, max_read_age: int = 300):
+        """
+        :param cache: Backing cache, all writes go through to it
+        :param max_entries: Number of entries kept in memory
+        :param max_read_age: Seconds an entry read from the backing cache is trusted,
+                             because its original write time is unknown
+        """
+        self._cache = cache
+        self._max_entries = max_entries
+        self._max_read_age = max_read_age
+        self._entries = OrderedDict()  # key -> (data, time it is valid from, max lifetime)
+        self._lock = threading.Lock()
+
+    def get(self, filename: str, age: Optional[int] = None):
+        """
+        Get a cached entry.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :return: Cached content or None if not found/expired
+        """
+        data, _ = self.get_stale(filename, age)
+        return data
+
+    def get_stale(self, filename: str, age: Optional[int] = None, max_stale: int = 0):
+        """
+        Get a cached entry, accepting entries that expired less than max_stale minutes ago.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :param max_stale: Maximum time in minutes an expired entry may still be served
+        :return: Tuple of cached content (None if not found/too old) and a stale flag
+        """
+        max_age = float("inf") if age is None else age * 60
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry:
+                data, since, lifetime = entry
+                if time.time() - since <= min(max_age, lifetime):
+                    self._entries.move_to_end(filename)
+                    return data, False
+
+        data, stale = self._cache.get_stale(filename, age, max_stale)
+
+        # Stale entries are about to be revalidated and entries read with an overridden age
+        # may already be expired, so neither is kept in memory
+        if data is not None and not stale and age is None:
+            self._remember(filename, data, self._max_read_age)
+
+        return data, stale
+
+    def add(self, filename: str, data: str, ttl: Optional[int] = None,
+            content_type: str = "application/json", grace: int = 0):
+        """
+        Add data to the memory tier and the backing cache.
+        :param filename: Cache key
+        :param data: Data to cache
+        :param ttl: Time to live in minutes, None if the entry does not expire
+        :param content_type: Content type of the data
+        :param grace: Minutes the entry is kept after it expired, so it can still be served
+                      stale or revalidated
+        :return: Result of the backing cache
+        """
+        result = self._cache.add(filename, data, ttl, content_type, grace)
+        if result is not None:
+            self._remember(filename, data, float("inf") if ttl is None else ttl * 60)
+        return result
+
+    def touch(self, filename: str) -> bool:
+        """
+        Mark a cached entry as fresh without rewriting its content.
+        :param filename: Cache key
+        :return: True on success
+        """
+        with self._lock:
+            self._entries.pop(filename, None)
+        return self._cache.touch(filename)
+
+    def clear(self) -> None:
+        """Delete all cached entries from memory and the backing cache."""
+        with self._lock:
+            self._entries.clear()
+        self._cache.clear()
+
+    def purge(self, throttle: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Delete expired entries from memory and the backing cache.
+        :param throttle: Called between two entries, returning False stops the purge
+        :return: Number of entries deleted from the backing cache
+        """
+        now = time.time()
+        with self._lock:
+            for filename, (_, since, lifetime) in list(self._entries.items()):
+                if now - since > lifetime:
+                    del self._entries[filename]
+        return self._cache.purge(throttle)
+
+    def compact(self) -> None:
+        """Give back unused space of the backing cache."""
+        self._cache.compact()
+
+    def close(self) -> None:
+        """Forget all entries in memory and close the backing cache."""
+        with self._lock:
+            self._entries.clear()
+        self._cache.close()
+
+    def _remember(self, filename: str, data: str, lifetime: float) -> None:
+        with self._lock:
+            self._entries[filename] = (data, time.time(), lifetime)
+            self._entries.move_to_end(filename)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,210 @@
+"""SQLite cache adapter - implements ICache with a single database file."""
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from resources.lib.adapters import cache_codec
+from resources.lib.ports.cache import ICache
+
+
+class SqliteCacheAdapter(ICache):
+    """SQLite implementation of cache adapter, all entries live in one WAL-mode database."""
+
+    access_resolution = 300  # Seconds, reads within this time of the last access write nothing
+
+    def __init__(self, path: str, max_bytes: int = 0, pinned=()):
+        """
+        :param path: Path of the database file, it is created if it does not exist
+        :param max_bytes: Byte budget of the cache (0 means unlimited)
+        :param pinned: Cache keys which are never evicted
+        """
+        self._max_bytes = max_bytes
+        self._pinned = tuple(pinned)
+        # The API client uses worker threads, so access is serialized with a lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # Only applies to new databases, allows compact() to free pages without a VACUUM
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, "
+            "data BLOB NOT NULL, "
+            "updated INTEGER NOT NULL, "
+            "ttl INTEGER, "
+            "expires INTEGER, "
+            "grace INTEGER NOT NULL DEFAULT 0, "
+            "accessed INTEGER NOT NULL DEFAULT 0, "
+            "size INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_purge ON cache (expires + grace * 60)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._create_size_table()
+
+    def get(self, filename: str, age: Optional[int] = None):
+        """
+        Get a cached entry.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :return: Cached content or None if not found/expired
+        """
+        data, _ = self.get_stale(filename, age)
+        return data
+
+    def get_stale(self, filename: str, age: Optional[int] = None, max_stale: int = 0):
+        """
+        Get a cached entry, accepting entries that expired less than max_stale minutes ago.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :param max_stale: Maximum time in minutes an expired entry may still be served
+        :return: Tuple of cached content (None if not found/too old) and a stale flag
+        """
+        now = int(time.time())
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT data, updated, ttl, accessed FROM cache WHERE key = ?", (filename,)
+                ).fetchone()
+
+                if not row:
+                    return None, False
+
+                data, updated, ttl, accessed = row
+                ttl = ttl if age is None else age
+                elapsed = now - updated
+                if ttl is not None and elapsed > (ttl + max_stale) * 60:
+                    return None, False
+
+                # Accesses only matter for eviction, and a coarse LRU order is good enough
+                if self._max_bytes and now - accessed > self.access_resolution:
+                    self._db.execute(
+                        "UPDATE cache SET accessed = ? WHERE key = ?", (now, filename)
+                    )
+        except sqlite3.Error:
+            # E.g. "database is locked" while another process writes, treat it as a miss
+            return None, False
+
+        return cache_codec.decode(data), ttl is not None and elapsed > ttl * 60
+
+    def add(self, filename: str, data: str, ttl: Optional[int] = None,
+            content_type: str = "application/json", grace: int = 0):
+        """
+        Add data to cache.
+        :param filename: Cache key
+        :param data: Data to cache
+        :param ttl: Time to live in minutes, None if the entry does not expire
+        :param content_type: Content type of the data
+        :param grace: Minutes the entry is kept after it expired, so it can still be served
+                      stale or revalidated
+        :return: Cache key on success, None on failure
+        """
+        now = int(time.time())
+        blob = cache_codec.encode(data, ttl, content_type, now, grace)
+        expires = None if ttl is None else now + ttl * 60
+        try:
+            # An upsert, unlike REPLACE, fires the UPDATE trigger that keeps the total size
+            self._execute(
+                "INSERT INTO cache (key, data, updated, ttl, expires, grace, accessed, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET data = excluded.data, "
+                "updated = excluded.updated, ttl = excluded.ttl, expires = excluded.expires, "
+                "grace = excluded.grace, accessed = excluded.accessed, size = excluded.size",
+                (filename, blob, now, ttl, expires, grace, now, len(blob))
+            )
+        except sqlite3.Error:
+            return None
+
+        if self._max_bytes:
+            self._evict()
+
+        return filename
+
+    def touch(self, filename: str) -> bool:
+        """
+        Mark a cached entry as fresh without rewriting its content.
+        :param filename: Cache key
+        :return: True on success
+        """
+        now = int(time.time())
+        try:
+            return self._execute(
+                "UPDATE cache SET updated = ?, expires = ? + ttl * 60 WHERE key = ?",
+                (now, now, filename)
+            ) > 0
+        except sqlite3.Error:
+            return False
+
+    def clear(self) -> None:
+        """Delete all cached entries."""
+        self._execute("DELETE FROM cache")
+
+    def purge(self, throttle: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Delete entries which expired longer than their grace period ago, in one statement.
+        :param throttle: Not used, the purge is a single indexed DELETE
+        :return: Number of deleted entries
+        """
+        return self._execute(
+            "DELETE FROM cache WHERE expires + grace * 60 < ?", (int(time.time()),)
+        )
+
+    def compact(self) -> None:
+        """Free unused pages and truncate the write-ahead log."""
+        with self._lock:
+            self._db.execute("PRAGMA incremental_vacuum")
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        """Close the database, waiting for a statement of another thread to finish."""
+        with self._lock:
+            self._db.close()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits into its byte budget."""
+        with self._lock:
+            total = self._db.execute("SELECT total FROM cache_size").fetchone()[0]
+            if total <= self._max_bytes:
+                return
+
+            # Rows are fetched lazily, only as many as needed are read
+            placeholders = ",".join("?" * len(self._pinned))
+            rows = self._db.execute(
+                f"SELECT key, size FROM cache WHERE key NOT IN ({placeholders}) "
+                "ORDER BY accessed",
+                self._pinned
+            )
+            evicted = []
+            for key, size in rows:
+                if total <= self._max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size
+            rows.close()
+
+            self._db.executemany("DELETE FROM cache WHERE key = ?", evicted)
+
+    def _create_size_table(self) -> None:
+        """Keep the total size of all entries up to date, so eviction never sums the table."""
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache_size (total INTEGER NOT NULL)")
+        if not self._db.execute("SELECT 1 FROM cache_size").fetchone():
+            self._db.execute(
+                "INSERT INTO cache_size (total) SELECT COALESCE(SUM(size), 0) FROM cache"
+            )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache "
+            "BEGIN UPDATE cache_size SET total = total + new.size; END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache "
+            "BEGIN UPDATE cache_size SET total = total + new.size - old.size; END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache "
+            "BEGIN UPDATE cache_size SET total = total - old.size; END"
+        )
+
+    def _execute(self, sql: str, parameters=()) -> int:
+        """Execute a statement and return the number of affected rows."""
+        with self._lock:
+            return self._db.execute(sql, parameters).rowcount
@@ -0,0 +1,143 @@
+"""SQLite search index adapter - implements ISearchIndex with an FTS5 table."""
+import json
+import sqlite3
+import threading
+import time
+from typing import List
+from resources.lib.models.list_item import ListItem
+from resources.lib.models.playlist import Playlist
+from resources.lib.models.serialization import from_dict, to_dict
+from resources.lib.models.track import Track
+from resources.lib.models.user import User
+from resources.lib.ports.search_index import ISearchIndex
+from resources.lib.soundcloud.query import normalize_query
+
+
+class SqliteSearchIndexAdapter(ISearchIndex):
+    """
+    SQLite implementation of the search index. Items are stored in a regular
+    table and indexed by an external-content FTS5 table; if the SQLite build
+    has no FTS5, queries fall back to LIKE matching.
+    """
+
+    kinds = (Track, User, Playlist)
+
+    def __init__(self, path: str, max_items: int = 20000):
+        """
+        :param path: Path of the database file, it is created if it does not exist
+        :param max_items: Number of items kept, the least recently seen ones are pruned
+        """
+        self._max_items = max_items
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "rowid INTEGER PRIMARY KEY, "
+            "kind TEXT NOT NULL, "
+            "id TEXT NOT NULL, "
+            "text TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "seen INTEGER NOT NULL, "
+            "UNIQUE (kind, id))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS items_seen ON items (seen)")
+        self._fts = self._create_fts()
+
+    def add(self, items: List[ListItem]) -> None:
+        """Add or update items in the index."""
+        now = int(time.time())
+        rows = [
+            (type(item).__name__, str(item.id), self._text(item), json.dumps(to_dict(item)), now)
+            for item in items if isinstance(item, self.kinds)
+        ]
+        if not rows:
+            return
+
+        # The connection commits, or rolls back if a statement fails (e.g. "database is locked"),
+        # so a failed add never leaves a write transaction open
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO items (kind, id, text, data, seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, id) DO UPDATE SET "
+                "text = excluded.text, data = excluded.data, seen = excluded.seen",
+                rows
+            )
+            self._prune()
+
+    def search(self, query: str, limit: int) -> List[ListItem]:
+        """Return the best matching items, most relevant and most recently seen first."""
+        terms = normalize_query(query).split()
+        if not terms:
+            return []
+
+        with self._lock:
+            if self._fts:
+                # Every term has to match, as a prefix, e.g. "dead rai" finds "Deadmau5 - Raise"
+                match = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+                rows = self._db.execute(
+                    "SELECT items.data FROM items_fts JOIN items ON items.rowid = items_fts.rowid "
+                    "WHERE items_fts MATCH ? ORDER BY bm25(items_fts), items.seen DESC LIMIT ?",
+                    (match, limit)
+                ).fetchall()
+            else:
+                conditions = " AND ".join("text LIKE ?" for _ in terms)
+                rows = self._db.execute(
+                    f"SELECT data FROM items WHERE {conditions} ORDER BY seen DESC LIMIT ?",
+                    [f"%{term}%" for term in terms] + [limit]
+                ).fetchall()
+
+        return [from_dict(json.loads(data)) for data, in rows]
+
+    def clear(self) -> None:
+        """Remove all items from the index."""
+        with self._lock:
+            self._db.execute("DELETE FROM items")
+
+    def close(self) -> None:
+        """Close the database, waiting for a statement of another thread to finish."""
+        with self._lock:
+            self._db.close()
+
+    def _prune(self) -> None:
+        """Delete the least recently seen items beyond max_items, a seek on the seen index."""
+        row = self._db.execute(
+            "SELECT seen FROM items ORDER BY seen DESC LIMIT 1 OFFSET ?", (self._max_items,)
+        ).fetchone()
+        if row:
+            self._db.execute("DELETE FROM items WHERE seen <= ?", row)
+
+    def _create_fts(self) -> bool:
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts "
+                "USING fts5(text, content='items', content_rowid='rowid')"
+            )
+        except sqlite3.OperationalError:
+            return False
+
+        # Keep the external-content index in sync with the items table
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN "
+            "INSERT INTO items_fts (rowid, text) VALUES (new.rowid, new.text); END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN "
+            "INSERT INTO items_fts (items_fts, rowid, text) "
+            "VALUES ('delete', old.rowid, old.text); END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN "
+            "INSERT INTO items_fts (items_fts, rowid, text) "
+            "VALUES ('delete', old.rowid, old.text); "
+            "INSERT INTO items_fts (rowid, text) VALUES (new.rowid, new.text); END"
+        )
+        return True
+
+    @staticmethod
+    def _text(item: ListItem) -> str:
+        info = getattr(item, "info", {}) or {}
+        parts = (item.label, item.label2, info.get("artist"))
+        return normalize_query(" ".join(str(part) for part in parts if part))
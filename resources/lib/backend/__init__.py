@@ -0,0 +1 @@
+# Resident backend service and its plugin client
@@ -0,0 +1,100 @@
+"""Backend client - forwards API calls to the resident backend service."""
+import socket
+
+from resources.lib.backend.protocol import HOST, decode_message, encode_message, from_wire
+from resources.lib.ports.logger import ILogger
+from resources.lib.soundcloud.api_interface import ApiInterface
+
+
+class BackendNetworkError(OSError):
+    """The backend could not reach the API, e.g. because the connection is down."""
+
+
+class BackendClient(ApiInterface):
+    """
+    Implements the API by calling the backend service. If the service cannot
+    be reached, all calls fall back to an in-process API client.
+    """
+
+    timeout_connect = 1
+    timeout_read = 60
+
+    def __init__(self, endpoint, fallback, logger: ILogger):
+        """
+        :param endpoint: Dict with port and token, as published by the backend server
+        :param fallback: Callable returning the in-process API client
+        """
+        self._endpoint = endpoint
+        self._fallback = fallback
+        self._logger = logger
+        self._available = True
+
+    def search(self, query, kind="tracks"):
+        return self._call("search", query, kind)
+
+    def charts(self, filters):
+        return self._call("charts", filters)
+
+    def call(self, url):
+        return self._call("call", url)
+
+    def discover(self, selection=None):
+        return self._call("discover", selection)
+
+    def search_fan_out(self, query):
+        return self._call("search_fan_out", query)
+
+    def prefetch(self, url):
+        return self._call("prefetch", url)
+
+    def resolve_id(self, id):
+        return self._call("resolve_id", id)
+
+    def resolve_url(self, url):
+        return self._call("resolve_url", url)
+
+    def resolve_media_url(self, url):
+        return self._call("resolve_media_url", url)
+
+    def reset(self):
+        """Make the backend drop its warm state, e.g. its memory cache after a cache clear."""
+        try:
+            self._request("reset", ())
+        except OSError as e:
+            # A backend that is not running has no state to drop
+            self._logger.warning(f"BackendClient() Could not reset backend: {e}")
+
+    def _call(self, method, *args):
+        if self._available:
+            try:
+                response = self._request(method, args)
+            except OSError as e:
+                self._logger.warning(
+                    f"BackendClient() Backend not reachable, using in-process API: {e}"
+                )
+                self._available = False
+            else:
+                if "error" in response:
+                    message = f"Backend error in {method}: {response['error']}"
+                    if response.get("network"):
+                        raise BackendNetworkError(message)
+                    raise RuntimeError(message)
+                return from_wire(response["result"])
+
+        return getattr(self._fallback(), method)(*args)
+
+    def _request(self, method, args):
+        address = (HOST, self._endpoint["port"])
+        with socket.create_connection(address, timeout=self.timeout_connect) as connection:
+            connection.settimeout(self.timeout_read)
+            connection.sendall(encode_message({
+                "token": self._endpoint["token"],
+                "method": method,
+                "args": list(args),
+            }))
+            with connection.makefile("rb") as response:
+                line = response.readline()
+
+        if not line:
+            raise ConnectionError("Empty response from backend")
+        return decode_message(line)
@@ -0,0 +1,51 @@
+"""Wire format shared by the backend server and its client (one JSON document per line)."""
+import json
+
+from resources.lib.models.list_item import ListItem
+from resources.lib.models.serialization import from_dict, to_dict
+from resources.lib.soundcloud.api_collection import ApiCollection
+
+ENDPOINT_FILENAME = "backend.json"
+HOST = "127.0.0.1"
+
+
+def encode_message(message):
+    return (json.dumps(message) + "\n").encode()
+
+
+def decode_message(line):
+    return json.loads(line.decode())
+
+
+def to_wire(value):
+    """Convert API results (collections, models, tuples) into JSON-serializable values."""
+    if isinstance(value, ApiCollection):
+        return {
+            "__collection__": {
+                "items": [to_wire(item) for item in value.items],
+                "next_href": value.next_href,
+                "unresolved": list(value.unresolved),
+            }
+        }
+    if isinstance(value, ListItem):
+        return to_dict(value)
+    if isinstance(value, (list, tuple)):
+        return [to_wire(item) for item in value]
+    return value
+
+
+def from_wire(value):
+    """Inverse of to_wire()."""
+    if isinstance(value, dict) and "__collection__" in value:
+        data = value["__collection__"]
+        collection = ApiCollection()
+        collection.items = [from_wire(item) for item in data["items"]]
+        collection.load = []
+        collection.unresolved = data["unresolved"]
+        collection.next_href = data["next_href"]
+        return collection
+    if isinstance(value, dict) and "__model__" in value:
+        return from_dict(value)
+    if isinstance(value, list):
+        return [from_wire(item) for item in value]
+    return value
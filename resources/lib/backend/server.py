@@ -0,0 +1,93 @@
+"""Backend server - serves API calls from warm state over a local socket."""
+import secrets
+import socketserver
+import threading
+
+from resources.lib.backend.protocol import (
+    ENDPOINT_FILENAME, HOST, decode_message, encode_message, to_wire
+)
+from resources.lib.ports.logger import ILogger
+
+
+class BackendServer:
+    """
+    Runs inside the service and owns a container (API client, pooled
+    connections, memory cache), so plugin invocations only pay for an RPC.
+    """
+
+    methods = (
+        "call", "charts", "discover", "prefetch", "resolve_id",
+        "resolve_media_url", "resolve_url", "search", "search_fan_out",
+    )
+
+    def __init__(self, container_factory, vfs, logger: ILogger):
+        """
+        :param container_factory: Callable returning a new Container
+        :param vfs: VFS of the addon profile, the endpoint file is written there
+        """
+        self._container_factory = container_factory
+        self._vfs = vfs
+        self._logger = logger
+        self._container = container_factory()
+        self._token = secrets.token_hex(16)
+        self._server = None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def start(self):
+        backend = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                response = backend.handle(decode_message(self.rfile.readline()))
+                self.wfile.write(encode_message(response))
+
+        self._server = socketserver.ThreadingTCPServer((HOST, 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="backend").start()
+
+        port = self._server.server_address[1]
+        self._vfs.save_obj_to_json(ENDPOINT_FILENAME, {"port": port, "token": self._token})
+        self._logger.info(f"BackendServer() Listening on port {port}")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._vfs.delete(ENDPOINT_FILENAME)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._container.close()
+        self._logger.info("BackendServer() Stopped")
+
+    def reset(self):
+        """Drop all warm state, e.g. after the settings changed or the cache was cleared."""
+        container, self._container = self._container, self._container_factory()
+        container.close()
+
+    def handle(self, request):
+        if not secrets.compare_digest(request.get("token", ""), self._token):
+            return {"error": "Invalid token"}
+
+        method = request.get("method")
+        if method == "reset":
+            self.reset()
+            return {"result": None}
+        if method not in self.methods:
+            return {"error": f"Unknown method {method}"}
+
+        container = self._container
+        try:
+            result = getattr(container.local_api, method)(*request.get("args", []))
+            if method == "search_fan_out":
+                result = []  # The searches keep running in the service
+            return {"result": to_wire(result)}
+        except Exception as e:
+            self._logger.error(f"BackendServer() {method} failed: {e}")
+            # Network errors (e.g. offline) are raised as such by the client, so callers can recover
+            return {"error": str(e), "network": isinstance(e, OSError)}
+        finally:
+            if container.is_built("metrics"):
+                container.metrics.flush()
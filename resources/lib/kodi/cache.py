@@ -1,4 +1,5 @@
 """Cache wrapper - kept for backward compatibility, but should use ICache port."""
+from typing import Callable, Optional
 from resources.lib.ports.cache import ICache
 
 
@@ -9,20 +10,63 @@ class Cache(ICache):
         """Initialize with an ICache implementation."""
         self._cache = cache
 
-    def get(self, filename: str, age: int = 60):
+    def get(self, filename: str, age: Optional[int] = None):
         """
         Get a cached file.
         :param filename: Cache key
-        :param age: Maximum age in minutes
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
         :return: Cached content or None if not found/expired
         """
         return self._cache.get(filename, age)
 
-    def add(self, filename: str, data: str):
+    def get_stale(self, filename: str, age: Optional[int] = None, max_stale: int = 0):
+        """
+        Get a cached file, accepting entries that expired less than max_stale minutes ago.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :param max_stale: Maximum time in minutes an expired entry may still be served
+        :return: Tuple of cached content (None if not found/too old) and a stale flag
+        """
+        return self._cache.get_stale(filename, age, max_stale)
+
+    def add(self, filename: str, data: str, ttl: Optional[int] = None,
+            content_type: str = "application/json", grace: int = 0):
         """
         Add data to cache.
         :param filename: Cache key
         :param data: Data to cache
+        :param ttl: Time to live in minutes, None if the entry does not expire
+        :param content_type: Content type of the data
+        :param grace: Minutes the entry is kept after it expired, so it can still be served
+                      stale or revalidated
         :return: Filepath on success, None on failure
         """
-        return self._cache.add(filename, data)
+        return self._cache.add(filename, data, ttl, content_type, grace)
+
+    def touch(self, filename: str) -> bool:
+        """
+        Mark a cached file as fresh without rewriting its content.
+        :param filename: Cache key
+        :return: True on success
+        """
+        return self._cache.touch(filename)
+
+    def clear(self) -> None:
+        """Delete all cached files."""
+        self._cache.clear()
+
+    def purge(self, throttle: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Delete files which expired longer than their grace period ago.
+        :param throttle: Called between two files, returning False stops the purge
+        :return: Number of deleted files
+        """
+        return self._cache.purge(throttle)
+
+    def compact(self) -> None:
+        """Give back unused space of the underlying store."""
+        self._cache.compact()
+
+    def close(self) -> None:
+        """Release open handles of the underlying store."""
+        self._cache.close()
@@ -0,0 +1,29 @@
+"""Cache factory - builds the configured cache stack, shared by the plugin and the service."""
+import os
+from resources.lib.ports.cache import ICache
+from resources.lib.ports.platform import IPlatformAdapter
+from resources.lib.ports.settings import ISettings
+from resources.lib.soundcloud.cache_policy import API_CLIENT_ID_CACHE_KEY
+
+CACHE_BACKEND_SQLITE = "1"
+
+
+def create_cache(platform: IPlatformAdapter, settings: ISettings) -> ICache:
+    """Create the cache backend selected in the settings, behind an in-process memory tier."""
+    # Backends are imported on demand, only the selected one is loaded (e.g. sqlite3)
+    from resources.lib.adapters.memory.cache_adapter import MemoryCacheAdapter
+
+    profile_path = platform.get_addon_profile_path()
+    max_bytes = int(settings.get("cache.size") or 0) * 1024 * 1024
+    pinned = (API_CLIENT_ID_CACHE_KEY,)
+
+    if settings.get("cache.backend") == CACHE_BACKEND_SQLITE:
+        from resources.lib.adapters.sqlite.cache_adapter import SqliteCacheAdapter
+        cache = SqliteCacheAdapter(os.path.join(profile_path, "cache.db"), max_bytes, pinned)
+    else:
+        from resources.lib.adapters.kodi.cache_adapter import KodiCacheAdapter
+        from resources.lib.adapters.kodi.filesystem_adapter import KodiFileSystemAdapter
+        filesystem = KodiFileSystemAdapter(os.path.join(profile_path, "cache"))
+        cache = KodiCacheAdapter(settings, filesystem, max_bytes, pinned)
+
+    return MemoryCacheAdapter(cache)
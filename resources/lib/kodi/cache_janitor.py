@@ -0,0 +1,45 @@
+"""Cache janitor - sweeps expired cache entries while Kodi is idle."""
+from resources.lib.ports.cache import ICache
+from resources.lib.ports.logger import ILogger
+
+
+class CacheJanitor:
+    """Periodically purges and compacts the cache, backing off whenever playback is active."""
+
+    initial_delay = 120  # Seconds after startup before the first sweep
+    interval = 3600  # Seconds between two sweeps
+    pause = 0.05  # Seconds between two inspected entries, keeps the I/O load low
+
+    def __init__(self, cache: ICache, logger: ILogger, monitor, player):
+        """
+        :param monitor: xbmc.Monitor (or compatible) used for waiting and abort detection
+        :param player: xbmc.Player (or compatible) used to detect playback
+        """
+        self._cache = cache
+        self._logger = logger
+        self._monitor = monitor
+        self._player = player
+
+    def run(self) -> None:
+        """Sweep until Kodi requests an abort."""
+        delay = self.initial_delay
+        while not self._monitor.waitForAbort(delay):
+            delay = self.interval
+            if self._player.isPlaying():
+                self._logger.debug("CacheJanitor() Skipping sweep during playback")
+                continue
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Purge expired entries and compact the store, returns the number of purged entries."""
+        # Each entry carries its own grace period, e.g. responses that can be revalidated
+        purged = self._cache.purge(self._throttle)
+        if not self._monitor.abortRequested():
+            self._cache.compact()
+        self._logger.debug(f"CacheJanitor() Purged {purged} cache entries")
+        return purged
+
+    def _throttle(self) -> bool:
+        if self._player.isPlaying():
+            return False
+        return not self._monitor.waitForAbort(self.pause)
@@ -0,0 +1,139 @@
+"""
+Dependency container - builds each service on first use.
+
+Adapters and services are imported inside the properties that build them, so
+network and parsing libraries (requests, hashlib, sqlite3, ...) are only loaded
+by routes that need them. Keep it that way when adding services.
+"""
+import os
+from functools import cached_property
+
+
+class Container:
+    """
+    Kodi starts a new interpreter for every navigation, so every service is
+    constructed lazily: a route only pays for the services it actually uses.
+    """
+
+    def is_built(self, name: str) -> bool:
+        """Check whether a service has been constructed already."""
+        return name in self.__dict__
+
+    def close(self) -> None:
+        """Release the connections and database handles of the services built so far."""
+        for name in ("http", "cache_adapter", "search_index"):
+            service = self.__dict__.get(name)
+            if service is not None:
+                service.close()
+
+    @cached_property
+    def platform(self):
+        from resources.lib.adapters.kodi.platform_adapter import KodiPlatformAdapter
+        return KodiPlatformAdapter()
+
+    @cached_property
+    def logger(self):
+        from resources.lib.adapters.kodi.logger_adapter import KodiLoggerAdapter
+        return KodiLoggerAdapter(self.platform.get_addon_id())
+
+    @cached_property
+    def settings_adapter(self):
+        from resources.lib.adapters.kodi.settings_adapter import KodiSettingsAdapter
+        return KodiSettingsAdapter()
+
+    @cached_property
+    def settings(self):
+        from resources.lib.kodi.settings import Settings
+        return Settings(self.settings_adapter)
+
+    @cached_property
+    def vfs_adapter(self):
+        from resources.lib.adapters.kodi.filesystem_adapter import KodiFileSystemAdapter
+        return KodiFileSystemAdapter(self.platform.get_addon_profile_path())
+
+    @cached_property
+    def vfs(self):
+        from resources.lib.kodi.vfs import VFS
+        return VFS(self.vfs_adapter)
+
+    @cached_property
+    def cache_adapter(self):
+        from resources.lib.kodi.cache_factory import create_cache
+        return create_cache(self.platform, self.settings)
+
+    @cached_property
+    def cache(self):
+        from resources.lib.kodi.cache import Cache
+        return Cache(self.cache_adapter)
+
+    @cached_property
+    def http(self):
+        from resources.lib.adapters.http.requests_adapter import RequestsHttpAdapter
+        return RequestsHttpAdapter()
+
+    @cached_property
+    def metrics(self):
+        from resources.lib.adapters.kodi.metrics_adapter import KodiMetricsAdapter
+        return KodiMetricsAdapter(self.vfs_adapter, self.settings.get_bool("metrics.enabled"))
+
+    @cached_property
+    def factory(self):
+        from resources.lib.adapters.kodi.list_item_factory import KodiListItemFactory
+        return KodiListItemFactory()
+
+    @cached_property
+    def api(self):
+        """The backend service if it is enabled and running, the in-process API otherwise."""
+        if self.settings.get_bool("service.backend"):
+            from resources.lib.backend.protocol import ENDPOINT_FILENAME
+            endpoint = self.vfs.get_json_as_obj(ENDPOINT_FILENAME)
+            if endpoint:
+                from resources.lib.backend.client import BackendClient
+                return BackendClient(endpoint, lambda: self.local_api, self.logger)
+
+        return self.local_api
+
+    @cached_property
+    def local_api(self):
+        from resources.lib.soundcloud.api_v2 import ApiV2
+        return ApiV2(
+            self.settings,
+            self.platform.get_language_iso_639_1(),
+            self.cache,
+            self.logger,
+            self.http,
+            self.metrics,
+            lambda: self.search_index
+        )
+
+    @cached_property
+    def search_index(self):
+        """Local index of seen tracks, users and playlists, or None if disabled."""
+        if not self.settings.get_bool("search.index"):
+            return None
+
+        from resources.lib.adapters.sqlite.search_index_adapter import SqliteSearchIndexAdapter
+        path = os.path.join(self.platform.get_addon_profile_path(), "index.db")
+        return SqliteSearchIndexAdapter(path)
+
+    @cached_property
+    def search_history(self):
+        from resources.lib.kodi.search_history import SearchHistory
+        return SearchHistory(self.settings, self.vfs)
+
+    @cached_property
+    def mapper(self):
+        from resources.lib.domain.model_mapper import ModelMapper
+        return ModelMapper(
+            factory=self.factory,
+            addon_base=self.platform.get_addon_base_url(),
+            blocked_label=self.platform.get_localized_string(30902),
+            preview_label=self.platform.get_localized_string(30903),
+            followers_label=self.platform.get_localized_string(30904),
+            likes_label=self.platform.get_localized_string(30905)
+        )
+
+    @cached_property
+    def items(self):
+        from resources.lib.kodi.items import Items
+        return Items(self.platform, self.factory, self.mapper, self.search_history)
@@ -0,0 +1,33 @@
+def format_metrics(snapshot):
+    """Render a metrics snapshot as plain text for the diagnostics dialog."""
+    counters = snapshot["counters"]
+    histograms = snapshot["histograms"]
+    lines = []
+
+    hits = counters.get("cache.hit", 0) + counters.get("cache.stale", 0)
+    lookups = hits + counters.get("cache.miss", 0)
+    lines.append(f"Cache hit rate: {_percent(hits, lookups)} of {lookups} lookups")
+    entity_hits = counters.get("entities.hit", 0)
+    entities = entity_hits + counters.get("entities.miss", 0)
+    lines.append(f"Entity hit rate: {_percent(entity_hits, entities)} of {entities} tracks")
+    lines.append("")
+
+    lines.extend(f"{name}: {value}" for name, value in sorted(counters.items()))
+    lines.append("")
+
+    for name, histogram in sorted(histograms.items()):
+        mean = histogram["sum"] / histogram["count"] if histogram["count"] else 0
+        buckets = ", ".join(
+            f"<={bound}: {count}" for bound, count in _sorted_buckets(histogram["buckets"])
+        )
+        lines.append(f"{name}: n={histogram['count']} mean={mean:.1f} [{buckets}]")
+
+    return "\n".join(lines)
+
+
+def _percent(part, total):
+    return f"{part / total:.0%}" if total else "n/a"
+
+
+def _sorted_buckets(buckets):
+    return sorted(buckets.items(), key=lambda bucket: float(bucket[0]))
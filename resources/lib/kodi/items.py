@@ -7,6 +7,37 @@ from resources.lib.kodi.search_history import SearchHistory
 
 import urllib.parse
 
+# Static menus as (label string ID, URL relative to the addon base, is folder, bold label)
+MENU_ROOT = (
+    (30101, PATH_SEARCH, True, False),  # Search
+    (30102, PATH_CHARTS, True, False),  # Charts
+    (30103, PATH_DISCOVER, True, False),  # Discover
+    (30108, PATH_ROOT + "?action=settings", False, False),  # Settings
+    # (30109, PATH_ROOT + "?action=signin", False, False),  # Sign in TODO
+)
+MENU_CHARTS = (
+    # TODO Top 50 not working anymore, replace with new GraphQL API
+    # (30301, PATH_CHARTS + "?action=top", True, True),
+    (30302, PATH_CHARTS + "?action=trending", True, True),  # Trending
+)
+MENU_SEARCH = (
+    (30201, PATH_SEARCH + "?action=new", True, True),  # New search
+    (30202, PATH_SEARCH + "?action=offline", True, True),  # Search offline / recent
+)
+
+# Dynamic menus as (label string ID, static query params)
+MENU_SEARCH_SUB = (
+    (30211, {"action": "people"}),
+    (30212, {"action": "albums"}),
+    (30213, {"action": "playlists"}),
+    (30215, {"action": "offline"}),
+)
+MENU_USER = (
+    (30212, "/users/{id}/albums"),
+    (30213, "/users/{id}/playlists_without_albums"),
+    (30214, "/users/{id}/spotlight"),
+)
+
 
 class Items:
     def __init__(self, platform: IPlatformAdapter, factory: IListItemFactory, 
@@ -18,162 +49,40 @@ class Items:
         self._addon_base = platform.get_addon_base_url()
 
     def root(self):
-        items = []
-
-        # Search
-        list_item = self._factory.create_list_item(
-            label=self._platform.get_localized_string(30101)
-        )
-        url = self._addon_base + PATH_SEARCH
-        items.append((url, list_item, True))
-
-        # Charts
-        list_item = self._factory.create_list_item(
-            label=self._platform.get_localized_string(30102)
-        )
-        url = self._addon_base + PATH_CHARTS
-        items.append((url, list_item, True))
-
-        # Discover
-        list_item = self._factory.create_list_item(
-            label=self._platform.get_localized_string(30103)
-        )
-        url = self._addon_base + PATH_DISCOVER
-        items.append((url, list_item, True))
-
-        # Settings
-        list_item = self._factory.create_list_item(
-            label=self._platform.get_localized_string(30108)
-        )
-        url = self._addon_base + "/?action=settings"
-        items.append((url, list_item, False))
-
-        # Sign in TODO
-        # list_item = self._factory.create_list_item(
-        #     label=self._platform.get_localized_string(30109)
-        # )
-        # url = self._addon_base + "/action=signin"
-        # items.append((url, list_item, False))
-
-        return items
+        return self._menu(MENU_ROOT)
 
     def search(self):
-        items = []
-
-        # New search
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30201))
-        )
-        url = self._addon_base + PATH_SEARCH + "?action=new"
-        items.append((url, list_item, True))
+        items = self._menu(MENU_SEARCH)
 
         # Search history
-        history = self.search_history.get()
-        for k in sorted(list(history), reverse=True):
-            query = history[k].get("query")
+        for query in self.search_history.get():
             list_item = self._factory.create_list_item(label=query)
             # Note: Context menu items would need to be added via factory if needed
             # For now, we'll skip this as it's a platform-specific feature
             url = self._addon_base + PATH_SEARCH + "?" + urllib.parse.urlencode({
-                "query": history[k].get("query")
+                "query": query
             })
             items.append((url, list_item, True))
 
         return items
 
     def search_sub(self, query):
-        items = []
-
-        # People
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30211))
-        )
-        url = self._addon_base + PATH_SEARCH + "?" + urllib.parse.urlencode({
-            "action": "people",
-            "query": query
-        })
-        items.append((url, list_item, True))
-
-        # Albums
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30212))
-        )
-        url = self._addon_base + PATH_SEARCH + "?" + urllib.parse.urlencode({
-            "action": "albums",
-            "query": query
-        })
-        items.append((url, list_item, True))
-
-        # Playlists
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30213))
-        )
-        url = self._addon_base + PATH_SEARCH + "?" + urllib.parse.urlencode({
-            "action": "playlists",
-            "query": query
-        })
-        items.append((url, list_item, True))
-
-        return items
+        return [
+            self._item(label, PATH_SEARCH + "?" + urllib.parse.urlencode({**params, "query": query}))
+            for label, params in MENU_SEARCH_SUB
+        ]
 
     def user(self, id):
-        items = []
-
-        # Albums
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30212))
-        )
-        url = self._addon_base + "/?" + urllib.parse.urlencode({
-            "action": "call",
-            "call": f"/users/{id}/albums"
-        })
-        items.append((url, list_item, True))
-
-        # Playlists
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30213))
-        )
-        url = self._addon_base + "/?" + urllib.parse.urlencode({
-            "action": "call",
-            "call": f"/users/{id}/playlists_without_albums"
-        })
-        items.append((url, list_item, True))
-
-        # Spotlight
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30214))
-        )
-        url = self._addon_base + "/?" + urllib.parse.urlencode({
-            "action": "call",
-            "call": f"/users/{id}/spotlight"
-        })
-        items.append((url, list_item, True))
-
-        return items
+        return [
+            self._item(label, "/?" + urllib.parse.urlencode({
+                "action": "call",
+                "call": call.format(id=id)
+            }))
+            for label, call in MENU_USER
+        ]
 
     def charts(self):
-        items = []
-
-        # Top 50
-        # TODO Not working anymore, replace with new GraphQL API
-        # list_item = self._factory.create_list_item(
-        #     label=format_bold(self._platform.get_localized_string(30301))
-        # )
-        # url = self._addon_base + PATH_CHARTS + "?" + urllib.parse.urlencode({
-        #     "action": "top"
-        # })
-        # items.append((url, list_item, True))
-
-        # Trending
-        list_item = self._factory.create_list_item(
-            label=format_bold(self._platform.get_localized_string(30302))
-        )
-        url = self._addon_base + PATH_CHARTS + "?" + urllib.parse.urlencode({
-            "action": "trending"
-        })
-        items.append((url, list_item, True))
-
-        return items
+        return self._menu(MENU_CHARTS)
 
     def from_collection(self, collection):
         items = []
@@ -192,3 +101,11 @@ class Items:
             items.append((url, next_item, True))
 
         return items
+
+    def _menu(self, entries):
+        return [self._item(label, url, is_folder, bold) for label, url, is_folder, bold in entries]
+
+    def _item(self, label_id, url, is_folder=True, bold=True):
+        label = self._platform.get_localized_string(label_id)
+        list_item = self._factory.create_list_item(label=format_bold(label) if bold else label)
+        return self._addon_base + url, list_item, is_folder
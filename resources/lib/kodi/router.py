@@ -0,0 +1,94 @@
+"""Route registry - maps plugin paths and actions to handlers."""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from resources.lib.ports.logger import ILogger
+from resources.lib.ports.metrics import IMetrics
+
+ANY_ACTION = "*"
+
+
+class Route:
+    """A registered handler for a path and action."""
+
+    def __init__(self, path: str, action: Optional[str], handler: Callable):
+        self.path = path
+        self.action = action
+        self.handler = handler
+
+    @property
+    def name(self) -> str:
+        if self.action in (None, ANY_ACTION):
+            return self.path
+        return f"{self.path}?action={self.action}"
+
+
+class Router:
+    """
+    Declarative route table. Handlers are registered for a path and an action
+    (None matches requests without action, ANY_ACTION matches every action) and
+    are called with the plugin handle and the parsed query args.
+
+    Middleware is called as middleware(route, call_next) around every handler.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, Optional[str]], Route] = {}
+        self._middleware: List[Callable] = []
+
+    def route(self, path: str, action: Optional[str] = ANY_ACTION):
+        """Decorator registering a handler."""
+        def decorator(handler):
+            self._routes[(path, action)] = Route(path, action, handler)
+            return handler
+        return decorator
+
+    def use(self, middleware: Callable) -> Callable:
+        """Add a middleware (also usable as decorator), the first added middleware runs outermost."""
+        self._middleware.append(middleware)
+        return middleware
+
+    def match(self, path: str, action: Optional[str]) -> Optional[Route]:
+        return self._routes.get((path, action)) or self._routes.get((path, ANY_ACTION))
+
+    def dispatch(self, path: str, handle: int, args: dict) -> bool:
+        """Call the handler registered for the request, returns False if there is none."""
+        route = self.match(path, args.get("action", [None])[0])
+        if route is None:
+            return False
+
+        self._call(route, 0, handle, args)
+        return True
+
+    def _call(self, route: Route, index: int, handle: int, args: dict) -> None:
+        if index == len(self._middleware):
+            route.handler(handle, args)
+        else:
+            self._middleware[index](route, lambda: self._call(route, index + 1, handle, args))
+
+
+class RouteTimer:
+    """Middleware recording wall time, HTTP requests and cache hits per route invocation."""
+
+    def __init__(self, metrics: IMetrics, logger: ILogger):
+        self._metrics = metrics
+        self._logger = logger
+
+    def __call__(self, route: Route, call_next: Callable) -> None:
+        before = self._metrics.pending()["counters"]
+        started = time.monotonic()
+        try:
+            call_next()
+        finally:
+            elapsed = (time.monotonic() - started) * 1000
+            after = self._metrics.pending()["counters"]
+            requests = after.get("http.requests", 0) - before.get("http.requests", 0)
+            hits = after.get("cache.hit", 0) - before.get("cache.hit", 0)
+
+            self._metrics.observe(f"route.time {route.name}", elapsed)
+            self._metrics.observe(f"route.http {route.name}", requests)
+            self._metrics.observe(f"route.cache_hits {route.name}", hits)
+            self._logger.debug(
+                f"Router() {route.name} took {elapsed:.0f} ms, "
+                f"{requests} requests, {hits} cache hits"
+            )
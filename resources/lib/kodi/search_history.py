@@ -1,37 +1,106 @@
+import json
 from time import time
 
+from resources.lib.soundcloud.query import normalize_query
+
 
 class SearchHistory:
+    """
+    Search history stored as an append-only log of JSON lines. Every add or
+    remove appends one line, so concurrent invocations cannot overwrite each
+    other's changes. The log is compacted once it has grown well beyond the
+    history size. It is read lazily, so only routes using the history pay for it.
+    """
 
-    filename = "search_history.json"
+    filename = "search_history.jsonl"
+    legacy_filename = "search_history.json"
+    compact_min_lines = 20
+    compact_factor = 2  # Compact once the log holds this many lines per history entry
 
     def __init__(self, settings, vfs):
         self.settings = settings
-        self.size = int(self.settings.get("search.history.size"))
+        self.size = self.settings.get_int("search.history.size")
         self.vfs = vfs
-        self.history = self.vfs.get_json_as_obj(self.filename)
+        self._entries = None  # Normalized query -> entry, oldest first
+        self._lines = 0
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._load()
+        return self._entries
 
     def get(self):
-        return {k: self.history[k] for k in list(self.history)[:self.size]}
+        """Return the most recent queries, newest first."""
+        queries = [entry["query"] for entry in reversed(self.entries.values())]
+        return queries[:self.size]
 
     def add(self, query):
-        for k, v in self.history.items():
-            if v["query"] == query:
-                return
+        key = normalize_query(query)
+        # Queries that only differ in case or whitespace share their cached results
+        if not self.size or key in self.entries:
+            return
 
-        self.history[str(int(time()))] = {"query": query}
-        self.history = self._reduce(self.history)
-        self._save()
+        entry = {"op": "add", "query": query, "time": int(time())}
+        self.entries[key] = entry
+        self._append(entry)
 
     def remove(self, query):
-        self.history = {k: v for k, v in list(self.history.items()) if v["query"] != query}
-        self._save()
+        key = normalize_query(query)
+        if self.entries.pop(key, None) is not None:
+            self._append({"op": "remove", "query": query, "time": int(time())})
 
     def clear(self):
+        self._entries = {}
+        self._lines = 0
+        self.vfs.delete(self.legacy_filename)
         return self.vfs.delete(self.filename)
 
-    def _save(self):
-        return self.vfs.save_obj_to_json(self.filename, self.history)
+    def _append(self, operation):
+        appended = self.vfs.append(self.filename, json.dumps(operation) + "\n")
+        self._lines += 1
+        compact_after = max(self.compact_min_lines, self.compact_factor * self.size)
+        # If the log cannot be appended to, rewriting it keeps the change
+        if not appended or self._lines > compact_after:
+            self._compact()
+
+    def _compact(self):
+        entries = list(self.entries.items())[-self.size:] if self.size else []
+        self._entries = dict(entries)
+        self._lines = len(entries)
+        self.vfs.write(self.filename, "".join(json.dumps(entry) + "\n" for _, entry in entries))
+
+    def _load(self):
+        self._entries = {}
+        self._lines = 0
+        log = self.vfs.read(self.filename)
+
+        if log is None:
+            self._migrate()
+            return
+
+        for line in log.splitlines():
+            try:
+                operation = json.loads(line)
+            except ValueError:
+                continue  # E.g. a line that is still being written by another invocation
+            self._lines += 1
+            key = normalize_query(operation["query"])
+            if operation["op"] == "add":
+                self._entries.setdefault(key, operation)
+            else:
+                self._entries.pop(key, None)
+
+    def _migrate(self):
+        """Import the history of the previous JSON file format."""
+        history = self.vfs.get_json_as_obj(self.legacy_filename)
+        if not history:
+            return
 
-    def _reduce(self, search):
-        return {k: search[k] for k in sorted(list(search), reverse=True)[:self.size]}
+        for k in sorted(history):
+            query = history[k]["query"]
+            self._entries.setdefault(
+                normalize_query(query), {"op": "add", "query": query, "time": int(k)}
+            )
+        self._compact()
+        self.vfs.delete(self.legacy_filename)
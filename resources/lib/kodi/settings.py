@@ -3,7 +3,13 @@ from resources.lib.ports.settings import ISettings
 
 
 class Settings(ISettings):
-    """Settings wrapper that implements ISettings port."""
+    """
+    Settings wrapper that implements ISettings port.
+
+    Values are read from the wrapped settings once and then served from a
+    snapshot. Long-lived processes have to call invalidate() when Kodi
+    reports changed settings.
+    """
     
     AUDIO_FORMATS = {
         "0": {
@@ -28,11 +34,36 @@ class Settings(ISettings):
     def __init__(self, settings: ISettings):
         """Initialize with an ISettings implementation."""
         self._settings = settings
+        self._values = {}
 
     def get(self, setting_id: str) -> str:
         """Get a setting value by ID."""
-        return self._settings.get(setting_id)
+        try:
+            return self._values[setting_id]
+        except KeyError:
+            value = self._values[setting_id] = self._settings.get(setting_id)
+            return value
+
+    def get_int(self, setting_id: str, default: int = 0) -> int:
+        """Get a setting value parsed as integer, or default if it is empty or invalid."""
+        try:
+            return int(self.get(setting_id))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, setting_id: str) -> bool:
+        """Get a boolean setting value."""
+        return self.get(setting_id) == "true"
+
+    def get_audio_format(self) -> dict:
+        """Get the preferred audio format (see AUDIO_FORMATS)."""
+        return self.AUDIO_FORMATS.get(self.get("audio.format"), self.AUDIO_FORMATS["2"])
 
     def set(self, setting_id: str, value: str) -> None:
         """Set a setting value."""
         self._settings.set(setting_id, value)
+        self._values[setting_id] = value
+
+    def invalidate(self) -> None:
+        """Discard the snapshot, values are read again on next access."""
+        self._values.clear()
@@ -18,6 +18,10 @@ class VFS:
         """Write content to a file."""
         return self._filesystem.write(filename, content)
 
+    def append(self, filename: str, content: str) -> bool:
+        """Append content to a file."""
+        return self._filesystem.append(filename, content)
+
     def delete(self, filename: str) -> bool:
         """Delete a file."""
         return self._filesystem.delete(filename)
@@ -0,0 +1,19 @@
+"""Conversion of domain models to and from JSON-serializable dicts."""
+from resources.lib.models.list_item import ListItem
+from resources.lib.models.playlist import Playlist
+from resources.lib.models.selection import Selection
+from resources.lib.models.track import Track
+from resources.lib.models.user import User
+
+MODELS = {model.__name__: model for model in (Playlist, Selection, Track, User)}
+
+
+def to_dict(item: ListItem) -> dict:
+    return {"__model__": type(item).__name__, "attrs": vars(item)}
+
+
+def from_dict(data: dict) -> ListItem:
+    attrs = data["attrs"]
+    item = MODELS[data["__model__"]](attrs["id"], attrs["label"])
+    item.__dict__.update(attrs)
+    return item
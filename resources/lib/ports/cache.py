@@ -1,28 +1,77 @@
 """Cache port - abstracts caching operations."""
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
 
 class ICache(ABC):
     """Interface for caching operations."""
     
     @abstractmethod
-    def get(self, filename: str, age: int = 60) -> Optional[str]:
+    def get(self, filename: str, age: Optional[int] = None) -> Optional[str]:
         """
         Get a cached file.
         :param filename: Cache key
-        :param age: Maximum age in minutes
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
         :return: Cached content or None if not found/expired
         """
         pass
     
     @abstractmethod
-    def add(self, filename: str, data: str) -> Optional[str]:
+    def get_stale(self, filename: str, age: Optional[int] = None,
+                  max_stale: int = 0) -> Tuple[Optional[str], bool]:
+        """
+        Get a cached file, accepting entries that expired less than max_stale minutes ago.
+        :param filename: Cache key
+        :param age: Maximum age in minutes, overrides the TTL the entry was written with
+        :param max_stale: Maximum time in minutes an expired entry may still be served
+        :return: Tuple of cached content (None if not found/too old) and a stale flag
+        """
+        pass
+    
+    @abstractmethod
+    def add(self, filename: str, data: str, ttl: Optional[int] = None,
+            content_type: str = "application/json", grace: int = 0) -> Optional[str]:
         """
         Add data to cache.
         :param filename: Cache key
         :param data: Data to cache
+        :param ttl: Time to live in minutes, None if the entry does not expire
+        :param content_type: Content type of the data
+        :param grace: Minutes the entry is kept after it expired, so it can still be served
+                      stale or revalidated
         :return: Filepath on success, None on failure
         """
         pass
-
+    
+    @abstractmethod
+    def touch(self, filename: str) -> bool:
+        """
+        Mark a cached file as fresh without rewriting its content.
+        :param filename: Cache key
+        :return: True on success
+        """
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete all cached files."""
+        pass
+    
+    @abstractmethod
+    def purge(self, throttle: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Delete files which expired longer than their grace period ago.
+        :param throttle: Called between two files, returning False stops the purge
+        :return: Number of deleted files
+        """
+        pass
+    
+    @abstractmethod
+    def compact(self) -> None:
+        """Give back unused space of the underlying store."""
+        pass
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Release open handles of the underlying store, the cache is not used afterwards."""
+        pass
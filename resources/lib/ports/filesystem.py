@@ -1,6 +1,6 @@
 """File system port - abstracts file operations."""
 from abc import ABC, abstractmethod
-from typing import Optional, Any
+from typing import Optional, Any, List
 
 
 class IFileSystem(ABC):
@@ -16,6 +16,26 @@ class IFileSystem(ABC):
         """Write content to a file. Returns filepath on success, None on failure."""
         pass
     
+    @abstractmethod
+    def read_bytes(self, filename: str, size: Optional[int] = None) -> Optional[bytes]:
+        """Read a binary file and return its contents, or only its first size bytes."""
+        pass
+    
+    @abstractmethod
+    def write_bytes(self, filename: str, content: bytes) -> Optional[str]:
+        """Write binary content to a file. Returns filepath on success, None on failure."""
+        pass
+    
+    @abstractmethod
+    def write_bytes_at(self, filename: str, offset: int, content: bytes) -> bool:
+        """Overwrite part of an existing file, starting at offset."""
+        pass
+    
+    @abstractmethod
+    def append(self, filename: str, content: str) -> bool:
+        """Append content to a file, the file is created if it does not exist."""
+        pass
+    
     @abstractmethod
     def delete(self, filename: str) -> bool:
         """Delete a file."""
@@ -31,6 +51,31 @@ class IFileSystem(ABC):
         """Get the last modification time of a file (timestamp)."""
         pass
     
+    @abstractmethod
+    def get_atime(self, filename: str) -> int:
+        """Get the last access time of a file (timestamp)."""
+        pass
+    
+    @abstractmethod
+    def set_atime(self, filename: str) -> bool:
+        """Set the access time of a file to now, keeping its modification time."""
+        pass
+    
+    @abstractmethod
+    def get_size(self, filename: str) -> int:
+        """Get the size of a file in bytes."""
+        pass
+    
+    @abstractmethod
+    def list_files(self) -> List[str]:
+        """List the names of all files in the file system root."""
+        pass
+    
+    @abstractmethod
+    def touch(self, filename: str) -> bool:
+        """Set the modification time of a file to now."""
+        pass
+    
     @abstractmethod
     def destroy(self) -> None:
         """Delete the entire file system root and all contents."""
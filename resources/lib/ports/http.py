@@ -0,0 +1,30 @@
+"""HTTP port - abstracts outgoing HTTP requests."""
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class IHttpClient(ABC):
+    """Interface for HTTP transport operations."""
+
+    @property
+    @abstractmethod
+    def pool_size(self) -> int:
+        """Number of connections kept open per host, more concurrent requests have to wait."""
+        pass
+
+    @abstractmethod
+    def get(self, url: str, params: Optional[dict] = None,
+            headers: Optional[dict] = None) -> Any:
+        """
+        Send a GET request.
+        :param url: Absolute URL
+        :param params: Query parameters
+        :param headers: Request headers
+        :return: Response object exposing status_code, headers, text and json()
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release all pooled connections."""
+        pass
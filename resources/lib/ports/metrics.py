@@ -0,0 +1,37 @@
+"""Metrics port - abstracts collection of counters and histograms."""
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class IMetrics(ABC):
+    """Interface for metrics collection."""
+    
+    @abstractmethod
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increase a counter."""
+        pass
+    
+    @abstractmethod
+    def observe(self, name: str, value: float) -> None:
+        """Record a value in a histogram."""
+        pass
+    
+    @abstractmethod
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all persisted and pending metrics as a JSON-serializable dict."""
+        pass
+    
+    @abstractmethod
+    def pending(self) -> Dict[str, Any]:
+        """Return a copy of the metrics collected since the last flush."""
+        pass
+    
+    @abstractmethod
+    def flush(self) -> None:
+        """Persist pending metrics."""
+        pass
+    
+    @abstractmethod
+    def reset(self) -> None:
+        """Discard all metrics."""
+        pass
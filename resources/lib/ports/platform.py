@@ -76,6 +76,11 @@ class IPlatformAdapter(ABC):
         """Show an OK dialog."""
         pass
     
+    @abstractmethod
+    def show_text_dialog(self, heading: str, text: str) -> None:
+        """Show a scrollable text dialog."""
+        pass
+    
     @abstractmethod
     def input_dialog(self, heading: str) -> Optional[str]:
         """Show an input dialog and return the entered text."""
@@ -0,0 +1,29 @@
+"""Search index port - abstracts the local index of seen tracks, users and playlists."""
+from abc import ABC, abstractmethod
+from typing import List
+
+from resources.lib.models.list_item import ListItem
+
+
+class ISearchIndex(ABC):
+    """Interface for a local full-text index of domain models."""
+    
+    @abstractmethod
+    def add(self, items: List[ListItem]) -> None:
+        """Add or update items in the index."""
+        pass
+    
+    @abstractmethod
+    def search(self, query: str, limit: int) -> List[ListItem]:
+        """Return the best matching items, without touching the network."""
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all items from the index."""
+        pass
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Release the open handles of the index, it is not used afterwards."""
+        pass
@@ -2,4 +2,5 @@ class ApiCollection:
     type = 0
     items = []
     load = []
+    unresolved = []
     next_href = ""
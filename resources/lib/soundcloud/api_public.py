@@ -1,4 +1,4 @@
-import requests
+from resources.lib.ports.http import IHttpClient
 from resources.lib.soundcloud.api_interface import ApiInterface
 
 
@@ -7,8 +7,11 @@ class ApiPublic(ApiInterface):
 
     api_host = "https://api.soundcloud.com/"
 
+    def __init__(self, http: IHttpClient):
+        self.http = http
+
     def _do_request(self, path, payload):
-        return requests.get(self.api_host + path, params=payload).json()
+        return self.http.get(self.api_host + path, params=payload).json()
 
     def search(self, query, kind):
         pass
@@ -1,8 +1,12 @@
 import hashlib
 import json
 import re
-import requests
+import threading
+import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Callable, Optional
 
 from resources.lib.models.playlist import Playlist
 from resources.lib.models.track import Track
@@ -10,29 +14,68 @@ from resources.lib.models.selection import Selection
 from resources.lib.models.user import User
 from resources.lib.soundcloud.api_collection import ApiCollection
 from resources.lib.soundcloud.api_interface import ApiInterface
+from resources.lib.soundcloud.cache_policy import (
+    API_CLIENT_ID_CACHE_KEY, API_CLIENT_ID_TTL, VALIDATORS_TTL
+)
+from resources.lib.soundcloud.entity_cache import EntityCache
+from resources.lib.soundcloud.query import normalize_query
+from resources.lib.ports.http import IHttpClient
 from resources.lib.ports.logger import ILogger
+from resources.lib.ports.metrics import IMetrics
+from resources.lib.ports.search_index import ISearchIndex
 
 
 class ApiV2(ApiInterface):
     """This class uses the unofficial API used by the SoundCloud website."""
 
     api_host = "https://api-v2.soundcloud.com"
-    api_client_id_cache_duration = 1440  # 24 hours
-    api_client_id_cache_key = "api-client-id"
+    api_client_id_cache_duration = API_CLIENT_ID_TTL
+    api_client_id_cache_key = API_CLIENT_ID_CACHE_KEY
     api_limit = 20
     api_limit_tracks = 50
+    api_hydration_workers = 4
     api_lang = "en"
     api_user_agent = "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:142.0) Gecko/20100101 Firefox/142.0"
     api_cache = {
-        "discover": 120  # 2 hours
+        "discover": 120,  # 2 hours
+        "entities": 360,  # 6 hours
+        "pages": 10,
+        "search": 60,  # Default, see setting "search.cache.ttl"
+        "validators": VALIDATORS_TTL
+    }
+    api_cache_stale = {
+        "discover": 1440  # Serve an outdated discover page for up to 24 hours
+    }
+    api_entity_kinds = ("track", "user", "playlist")
+    api_search_kinds = ("users", "albums", "playlists_without_albums")  # Search sub-menus
+    api_entity_paths = {
+        "playlists": "playlist",
+        "users": "user"
     }
     thumbnail_size = 500
 
-    def __init__(self, settings, lang, cache, logger: ILogger):
+    def __init__(self, settings, lang, cache, logger: ILogger, http: IHttpClient, metrics: IMetrics,
+                 index: Callable[[], Optional[ISearchIndex]] = None):
+        """
+        :param index: Optional factory of the local search index, it is called when the first
+                      collection is mapped; every mapped track, user and playlist is added to it
+        """
         self.cache = cache
         self.settings = settings
         self.logger = logger
-        self.api_limit = int(self.settings.get("search.items.size"))
+        self.http = http
+        self.metrics = metrics
+        self.index_factory = index
+        self.client_id_lock = threading.Lock()
+        self.entities = EntityCache(cache, self.api_cache["entities"])
+        self.api_limit = self.settings.get_int("search.items.size", self.api_limit)
+        self.api_hydration_workers = self.settings.get_int("apiv2.hydration.workers", 1)
+        self.api_cache = {
+            **self.api_cache,
+            # Listings are only cached to serve prefetched pages, otherwise they stay fresh
+            "pages": self.api_cache["pages"] if self.settings.get_bool("prefetch.enabled") else 0,
+            "search": self.settings.get_int("search.cache.ttl", self.api_cache["search"])
+        }
 
         if self.settings.get("apiv2.locale") == self.settings.APIV2_LOCALE["auto"]:
             self.api_lang = lang
@@ -46,27 +89,74 @@ class ApiV2(ApiInterface):
             return client_id_settings
 
         # Check if there is a cached client ID
-        client_id_cached = self.cache.get(
-            self.api_client_id_cache_key,
-            self.api_client_id_cache_duration
-        )
+        client_id_cached = self.cache.get(self.api_client_id_cache_key)
         if client_id_cached:
             self.logger.debug("ApiV2() Using cached client ID")
             return client_id_cached
 
-        # Extract client ID from website and cache it
-        client_id = self.fetch_client_id()
-        self.cache.add(self.api_client_id_cache_key, client_id)
-        self.logger.debug("ApiV2() Using new client ID")
+        # Concurrent requests (search fan-out, hydration) must not all scrape the website
+        with self.client_id_lock:
+            client_id_cached = self.cache.get(self.api_client_id_cache_key)
+            if client_id_cached:
+                self.logger.debug("ApiV2() Using cached client ID")
+                return client_id_cached
+
+            # Extract client ID from website and cache it
+            client_id = self.fetch_client_id()
+            self.cache.add(
+                self.api_client_id_cache_key,
+                client_id,
+                self.api_client_id_cache_duration,
+                "text/plain"
+            )
+            self.logger.debug("ApiV2() Using new client ID")
 
         return client_id
 
+    @cached_property
+    def index(self) -> Optional[ISearchIndex]:
+        # Resolving media URLs never maps a collection, so it does not open the index
+        return self.index_factory() if self.index_factory else None
+
     def search(self, query, kind="tracks"):
-        res = self._do_request("/search/" + kind, {"q": query, "limit": self.api_limit})
+        res = self._search_request(query, kind)
         return self._map_json_to_collection(res)
 
+    def search_fan_out(self, query):
+        """
+        Run the searches of the sub-menus in the background while the track results
+        are loaded, so the sub-menus are served from the cache when opened.
+        :return: The started threads, none if the search cache is disabled
+        """
+        if not self.api_cache["search"]:
+            return []  # The results could not be served from the cache, so do not fetch them
+
+        self.api_client_id  # Resolve the client ID once, before the threads need it
+        threads = []
+        for kind in self.api_search_kinds:
+            thread = threading.Thread(
+                target=self._search_in_background, args=(query, kind), name="search"
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _search_in_background(self, query, kind):
+        try:
+            self._search_request(query, kind)
+        except Exception as e:
+            self.logger.warning(f"ApiV2() Background search for {kind} failed: {e}")
+
+    def _search_request(self, query, kind):
+        # Results are cached, so sub-menus and searches from the history open instantly
+        return self._do_request(
+            "/search/" + kind, {"q": query, "limit": self.api_limit}, self.api_cache["search"]
+        )
+
     def discover(self, selection_id=None):
-        res = self._do_request("/mixed-selections", {}, self.api_cache["discover"])
+        res = self._do_request(
+            "/mixed-selections", {}, self.api_cache["discover"], self.api_cache_stale["discover"]
+        )
 
         if selection_id and "collection" in res:
             res = self._find_id_in_selection(res["collection"], selection_id)
@@ -80,16 +170,45 @@ class ApiV2(ApiInterface):
 
     def call(self, url):
         url = urllib.parse.urlparse(url)
-        res = self._do_request(url.path, urllib.parse.parse_qs(url.query))
+        entity = self._match_entity_path(url)
+        if entity:
+            res = self.entities.get(*entity)
+            if res:
+                return self._map_json_to_collection(res)
+
+        # With prefetching on, pages are cached briefly, so prefetched pages are served from it
+        cache = 0 if entity else self.api_cache["pages"]
+        res = self._do_request(url.path, urllib.parse.parse_qs(url.query), cache)
+        if entity and res.get("kind") == entity[0]:
+            self.entities.add(res)
+
         return self._map_json_to_collection(res)
 
+    def prefetch(self, url):
+        """
+        Load a page (including its track hydration) into the cache used by call().
+        :return: Tuple of the mapped collection and the size of the page in bytes
+        """
+        url = urllib.parse.urlparse(url)
+        res = self._do_request(
+            url.path, urllib.parse.parse_qs(url.query), self.api_cache["pages"]
+        )
+        return self._map_json_to_collection(res), len(json.dumps(res))
+
     def resolve_id(self, id):
+        track = self.entities.get("track", id)
+        if track:
+            return self._map_json_to_collection({"collection": [track]})
+
         res = self._do_request("/tracks", {"ids": id})
+        self.entities.add_many("track", res)
         return self._map_json_to_collection({"collection": res})
 
     def resolve_url(self, url):
         url = self._sanitize_url(url)
         res = self._do_request("/resolve", {"url": url})
+        if res.get("kind") in self.api_entity_kinds:
+            self.entities.add(res)
         return self._map_json_to_collection(res)
 
     def resolve_media_url(self, url):
@@ -97,12 +216,17 @@ class ApiV2(ApiInterface):
         res = self._do_request(url.path, urllib.parse.parse_qs(url.query))
         return res.get("url")
 
-    def _do_request(self, path, payload, cache=0):
+    def _do_request(self, path, payload, cache=0, stale=0):
+        """
+        :param cache: Maximum age of a cached response in minutes (0 disables caching)
+        :param stale: Time in minutes an expired response is still served while it is
+                      refreshed in the background (stale-while-revalidate)
+        """
         payload["client_id"] = self.api_client_id
         payload["app_locale"] = self.api_lang
         headers = {"Accept-Encoding": "gzip", "User-Agent": self.api_user_agent}
         path = self.api_host + path
-        cache_key = hashlib.sha1((path + str(payload)).encode()).hexdigest()
+        cache_key = self._cache_key(path, payload)
 
         self.logger.debug(
             f"ApiV2() Calling {path} with header {headers} and payload {payload}"
@@ -110,24 +234,73 @@ class ApiV2(ApiInterface):
 
         # If caching is active, check for an existing cached file.
         if cache:
-            cached_response = self.cache.get(cache_key, cache)
-            if cached_response:
+            cached_response, is_stale = self.cache.get_stale(cache_key, max_stale=stale)
+            if cached_response and is_stale:
+                self.logger.debug("ApiV2() Stale cache hit, revalidating in background")
+                self.metrics.increment("cache.stale")
+                self.metrics.increment("cache.bytes_read", len(cached_response))
+                threading.Thread(
+                    target=self._fetch,
+                    args=(path, payload, headers, cache_key, cache, stale),
+                    name="revalidate"
+                ).start()
+                return json.loads(cached_response)
+            elif cached_response:
                 self.logger.debug("ApiV2() Cache hit")
+                self.metrics.increment("cache.hit")
+                self.metrics.increment("cache.bytes_read", len(cached_response))
                 return json.loads(cached_response)
+            self.metrics.increment("cache.miss")
 
-        # Send the request.
-        response = requests.get(path, headers=headers, params=payload).json()
+        return self._fetch(path, payload, headers, cache_key if cache else None, cache, stale)
 
-        # If caching is active, cache the response.
-        if cache:
-            self.cache.add(cache_key, json.dumps(response))
+    def _fetch(self, path, payload, headers, cache_key=None, cache=0, stale=0):
+        """Send the request and cache the response for cache minutes if a key is given."""
+        cached_response = None
+        request_headers = headers
 
-        return response
+        # Revalidate an expired response instead of downloading it again.
+        if cache_key:
+            validators = self.cache.get(cache_key + "-validators")
+            if validators:
+                # The response itself is expired, so its TTL is overridden here
+                cached_response = self.cache.get(cache_key, self.api_cache["validators"])
+            if cached_response:
+                request_headers = {**headers, **self._conditional_headers(json.loads(validators))}
+
+        started = time.monotonic()
+        response = self.http.get(path, params=payload, headers=request_headers)
+        self.metrics.observe(
+            "http.latency " + self._endpoint(path), (time.monotonic() - started) * 1000
+        )
+        self.metrics.increment("http.requests")
+
+        if cached_response and response.status_code == 304:
+            self.logger.debug("ApiV2() Cached response is still valid")
+            self.metrics.increment("cache.not_modified")
+            self.cache.touch(cache_key)
+            return json.loads(cached_response)
+
+        res = response.json()
+
+        if cache_key:
+            data = json.dumps(res)
+            validators = self._extract_validators(response.headers)
+            # Once expired, the response is only worth keeping to serve it stale or revalidate it
+            grace = self.api_cache["validators"] if validators else stale
+            self.cache.add(cache_key, data, cache, grace=grace)
+            self.metrics.increment("cache.bytes_written", len(data))
+            if validators:
+                self.cache.add(
+                    cache_key + "-validators", json.dumps(validators), self.api_cache["validators"]
+                )
+
+        return res
 
     def _extract_media_url(self, transcodings):
-        setting = self.settings.get("audio.format")
+        audio_format = self.settings.get_audio_format()
         for codec in transcodings:
-            if self._is_preferred_codec(codec["format"], self.settings.AUDIO_FORMATS[setting]):
+            if self._is_preferred_codec(codec["format"], audio_format):
                 return codec["url"]
 
         # Fallback
@@ -149,6 +322,7 @@ class ApiV2(ApiInterface):
         collection = ApiCollection()
         collection.items = []  # Reset list in order to resolve problems in unit tests.
         collection.load = []
+        collection.unresolved = []
         collection.next_href = json_obj.get("next_href", None)
 
         if "kind" in json_obj and json_obj["kind"] == "track":
@@ -162,8 +336,9 @@ class ApiV2(ApiInterface):
 
                 if kind == "track":
                     if "title" not in item:
-                        # Track not fully returned by API
+                        # Track not fully returned by API, keep its slot for hydration
                         collection.load.append(item["id"])
+                        collection.items.append(None)
                         continue
 
                     track = self._build_track(item)
@@ -209,8 +384,9 @@ class ApiV2(ApiInterface):
 
             for item in json_obj["tracks"]:
                 if "title" not in item:
-                    # Track not fully returned by API
+                    # Track not fully returned by API, keep its slot for hydration
                     collection.load.append(item["id"])
+                    collection.items.append(None)
                     continue
 
                 track = self._build_track(item)
@@ -222,19 +398,72 @@ class ApiV2(ApiInterface):
 
         # Load unresolved tracks
         if collection.load:
-            # The API only supports a max of 50 track IDs per request:
-            for chunk in self._chunks(collection.load, self.api_limit_tracks):
-                track_ids = ",".join(str(x) for x in chunk)
-                loaded_tracks = self._do_request("/tracks", {"ids": track_ids})
-                # Because returned tracks are not sorted, we have to manually match them
-                for track_id in chunk:
-                    loaded_track = [lt for lt in loaded_tracks if lt["id"] == track_id]
-                    if len(loaded_track):  # Sometimes a track cannot be resolved
-                        track = self._build_track(loaded_track[0])
-                        collection.items.append(track)
+            self._hydrate_tracks(collection)
+
+        if self.index is not None:
+            self._add_to_index(collection.items)
 
         return collection
 
+    def _add_to_index(self, items):
+        # The index is a convenience, it must never break a listing
+        try:
+            self.index.add(items)
+        except Exception as e:
+            self.logger.warning(f"ApiV2() Could not update search index: {e}")
+
+    def _hydrate_tracks(self, collection):
+        """Load track stubs and put them back into the slots they were reserved in."""
+        # Because returned tracks are not sorted, we have to index them by ID
+        loaded_tracks = self.entities.get_many("track", collection.load)
+        missing = [x for x in dict.fromkeys(collection.load) if x not in loaded_tracks]
+        self.metrics.increment("entities.hit", len(loaded_tracks))
+        self.metrics.increment("entities.miss", len(missing))
+
+        # The API only supports a max of 50 track IDs per request:
+        chunks = list(self._chunks(missing, self.api_limit_tracks))
+        self.metrics.observe("hydration.chunks", len(chunks))
+        loaded = [track for response in self._load_chunks(chunks) for track in response]
+        self.entities.add_many("track", loaded)
+        for loaded_track in loaded:
+            loaded_tracks[loaded_track["id"]] = loaded_track
+
+        track_ids = iter(collection.load)
+        items = []
+        for item in collection.items:
+            if item is not None:
+                items.append(item)
+                continue
+
+            track_id = next(track_ids)
+            if track_id in loaded_tracks:
+                items.append(self._build_track(loaded_tracks[track_id]))
+            else:
+                # Sometimes a track cannot be resolved
+                collection.unresolved.append(track_id)
+
+        collection.items = items
+
+        if collection.unresolved:
+            self.logger.debug(f"ApiV2() Could not resolve tracks {collection.unresolved}")
+
+    def _load_chunks(self, chunks):
+        """Fetch track chunks with a bounded worker pool, results keep the chunk order."""
+        if not chunks:
+            return []
+
+        # More workers than pooled connections would only open throwaway connections
+        workers = min(self.api_hydration_workers, len(chunks), self.http.pool_size)
+        if workers < 2:
+            return [self._load_tracks(chunk) for chunk in chunks]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._load_tracks, chunks))
+
+    def _load_tracks(self, chunk):
+        track_ids = ",".join(str(x) for x in chunk)
+        return self._do_request("/tracks", {"ids": track_ids})
+
     def _build_track(self, item):
         if type(item.get("publisher_metadata")) is dict:
             artist = item["publisher_metadata"].get("artist", item["user"]["username"])
@@ -257,12 +486,11 @@ class ApiV2(ApiInterface):
 
         return track
 
-    @staticmethod
-    def fetch_client_id():
-        headers = {"Accept-Encoding": "gzip", "User-Agent": ApiV2.api_user_agent}
+    def fetch_client_id(self):
+        headers = {"Accept-Encoding": "gzip", "User-Agent": self.api_user_agent}
 
         # Get the HTML (includes a reference to the JS file we need)
-        html = requests.get("https://soundcloud.com/", headers=headers).text
+        html = self.http.get("https://soundcloud.com/", headers=headers).text
 
         # Extract the HREF to the JS file (which contains the API key)
         matches = re.findall(r"=\"(https://a-v2\.sndcdn\.com/assets/.*.js)\"", html)
@@ -270,7 +498,7 @@ class ApiV2(ApiInterface):
         if matches:
             for match in matches:
                 # Get the JS
-                response = requests.get(match, headers=headers)
+                response = self.http.get(match, headers=headers)
                 response.encoding = "utf-8"  # This speeds up `response.text` by 3 seconds
 
                 # Extract the API key
@@ -283,6 +511,47 @@ class ApiV2(ApiInterface):
         else:
             raise Exception("Failed to extract js href from html")
 
+    def _match_entity_path(self, url):
+        """Return (kind, id) if the URL points to a single cacheable entity."""
+        parts = url.path.strip("/").split("/")
+        if not url.query and len(parts) == 2 and parts[0] in self.api_entity_paths:
+            return self.api_entity_paths[parts[0]], parts[1]
+
+    @staticmethod
+    def _cache_key(url, payload):
+        """
+        Build a cache key that only depends on the requested resource: the client ID is
+        left out, parameters are sorted and search queries are normalized.
+        """
+        params = {k: v for k, v in payload.items() if k != "client_id"}
+        if isinstance(params.get("q"), str):
+            params["q"] = normalize_query(params["q"])
+        canonical = url + "?" + json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def _endpoint(url):
+        """Reduce a request URL to its endpoint, so metrics of e.g. different users add up."""
+        return re.sub(r"/[^/]*\d[^/]*", "/:id", urllib.parse.urlparse(url).path)
+
+    @staticmethod
+    def _extract_validators(headers):
+        validators = {}
+        if headers.get("ETag"):
+            validators["etag"] = headers.get("ETag")
+        if headers.get("Last-Modified"):
+            validators["last_modified"] = headers.get("Last-Modified")
+        return validators
+
+    @staticmethod
+    def _conditional_headers(validators):
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
     @staticmethod
     def _is_preferred_codec(codec, setting):
         return codec["mime_type"] == setting["mime_type"] and \
@@ -0,0 +1,5 @@
+"""Cache keys and lifetimes shared with the cache stack, importable without loading ApiV2."""
+
+API_CLIENT_ID_CACHE_KEY = "api-client-id"
+API_CLIENT_ID_TTL = 1440  # 24 hours
+VALIDATORS_TTL = 10080  # 7 days, responses with ETag/Last-Modified can be revalidated that long
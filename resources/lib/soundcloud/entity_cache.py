@@ -0,0 +1,85 @@
+"""Entity cache - keeps single API objects (tracks, users, playlists) by kind and ID."""
+import hashlib
+import json
+import threading
+import time
+from resources.lib.ports.cache import ICache
+
+
+class EntityCache:
+    """
+    Caches API entities by ID, so only missing entities have to be requested.
+    Entities added together are written as one batch entry, and a per-kind index maps each
+    ID to its batch. A hydrated playlist costs two cache writes instead of one per track,
+    while lookups stay per ID, so batches written by other listings are reused.
+    """
+
+    cache_key_prefix = "entity"
+
+    def __init__(self, cache: ICache, age: int):
+        """
+        :param cache: Cache the entities are stored in
+        :param age: Time to live of an entity in minutes
+        """
+        self._cache = cache
+        self._age = age
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, id):
+        """Get a single entity or None if it is not cached."""
+        return self.get_many(kind, [id]).get(id)
+
+    def get_many(self, kind: str, ids) -> dict:
+        """
+        Get all cached entities of the given IDs.
+        :return: The entities keyed by the given IDs, IDs which are not cached are missing
+        """
+        index = self._read_index(kind)
+        batches = {}
+        for id in ids:
+            entry = index.get(str(id))
+            if entry:
+                batches.setdefault(entry[0], set()).add(str(id))
+
+        found = {}
+        for batch, wanted in batches.items():
+            cached = self._cache.get(self._batch_key(kind, batch))
+            for entity in json.loads(cached) if cached else []:
+                if str(entity["id"]) in wanted:
+                    found[str(entity["id"])] = entity
+
+        return {id: found[str(id)] for id in ids if str(id) in found}
+
+    def add(self, entity: dict) -> None:
+        """Add a complete entity as returned by the API."""
+        self.add_many(entity["kind"], [entity])
+
+    def add_many(self, kind: str, entities) -> None:
+        """Add entities of the same kind as one batch."""
+        entities = list(entities)
+        if not entities:
+            return
+
+        ids = sorted(str(entity["id"]) for entity in entities)
+        batch = hashlib.sha1(",".join(ids).encode()).hexdigest()
+        self._cache.add(self._batch_key(kind, batch), json.dumps(entities), self._age)
+
+        # Read, merge and write back, so IDs indexed by other batches are kept
+        with self._lock:
+            now = int(time.time())
+            index = {
+                id: entry for id, entry in self._read_index(kind).items()
+                if now - entry[1] < self._age * 60
+            }
+            index.update({id: [batch, now] for id in ids})
+            self._cache.add(self._index_key(kind), json.dumps(index), self._age)
+
+    def _read_index(self, kind: str) -> dict:
+        cached = self._cache.get(self._index_key(kind))
+        return json.loads(cached) if cached else {}
+
+    def _index_key(self, kind: str) -> str:
+        return f"{self.cache_key_prefix}-{kind}-index"
+
+    def _batch_key(self, kind: str, batch: str) -> str:
+        return f"{self.cache_key_prefix}-{kind}-{batch}"
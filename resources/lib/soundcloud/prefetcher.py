@@ -0,0 +1,43 @@
+"""Prefetcher - loads the following pages of a listing in the background."""
+import threading
+from resources.lib.ports.logger import ILogger
+
+
+class Prefetcher:
+    """Warms the cache with the pages behind a next_href, bounded by depth and bytes."""
+
+    def __init__(self, api, logger: ILogger, depth: int, max_bytes: int):
+        self._api = api
+        self._logger = logger
+        self._depth = depth
+        self._max_bytes = max_bytes
+
+    def start(self, next_href):
+        """
+        Start prefetching in a background thread.
+        :param next_href: URL of the first page to load
+        :return: The started thread or None if there is nothing to prefetch
+        """
+        if not next_href or self._depth < 1:
+            return None
+
+        thread = threading.Thread(target=self._run, args=(next_href,), name="prefetch")
+        thread.start()
+        return thread
+
+    def _run(self, url):
+        loaded_bytes = 0
+
+        for _ in range(self._depth):
+            try:
+                collection, size = self._api.prefetch(url)
+            except Exception as e:
+                self._logger.warning(f"Prefetcher() Could not load {url}: {e}")
+                return
+
+            loaded_bytes += size
+            self._logger.debug(f"Prefetcher() Loaded {url} ({size} bytes)")
+
+            url = collection.next_href
+            if not url or loaded_bytes >= self._max_bytes:
+                return
@@ -0,0 +1,9 @@
+import unicodedata
+
+
+def normalize_query(query):
+    """
+    Normalize a search query for comparisons and cache keys: unicode
+    compatibility forms (NFKC), case and runs of whitespace are ignored.
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
@@ -1,62 +1,18 @@
 """Main plugin entry point - composition root for ports-and-adapters architecture."""
-import os
 import sys
+import threading
 import urllib.parse
 
-# Import adapters
-from resources.lib.adapters.kodi.platform_adapter import KodiPlatformAdapter
-from resources.lib.adapters.kodi.filesystem_adapter import KodiFileSystemAdapter
-from resources.lib.adapters.kodi.cache_adapter import KodiCacheAdapter
-from resources.lib.adapters.kodi.settings_adapter import KodiSettingsAdapter
-from resources.lib.adapters.kodi.list_item_factory import KodiListItemFactory
-from resources.lib.adapters.kodi.logger_adapter import KodiLoggerAdapter
-
-# Import domain/use cases
-from resources.lib.soundcloud.api_v2 import ApiV2
-from resources.lib.kodi.items import Items
-from resources.lib.kodi.search_history import SearchHistory
-from resources.lib.domain.model_mapper import ModelMapper
+# Import the container only, services and their dependencies are imported on first use
+from resources.lib.kodi.container import Container
+from resources.lib.kodi.router import Router, RouteTimer
 
 # Import routes
 from resources.routes import *
 
-# Import XBMC only for plugin handle and args (minimal usage at composition root)
-import xbmcplugin
-
-# Initialize adapters (composition root)
-platform = KodiPlatformAdapter()
-logger = KodiLoggerAdapter(platform.get_addon_id())
-settings_adapter = KodiSettingsAdapter()
-vfs_adapter = KodiFileSystemAdapter(platform.get_addon_profile_path())
-vfs_cache_adapter = KodiFileSystemAdapter(os.path.join(platform.get_addon_profile_path(), "cache"))
-cache_adapter = KodiCacheAdapter(settings_adapter, vfs_cache_adapter)
-factory = KodiListItemFactory()
-
-# Wrap adapters for backward compatibility (if needed)
-from resources.lib.kodi.settings import Settings
-from resources.lib.kodi.vfs import VFS
-from resources.lib.kodi.cache import Cache
-settings = Settings(settings_adapter)
-vfs = VFS(vfs_adapter)
-vfs_cache = VFS(vfs_cache_adapter)
-cache = Cache(cache_adapter)
-
-# Initialize domain services
-api = ApiV2(settings, platform.get_language_iso_639_1(), cache, logger)
-search_history = SearchHistory(settings, vfs)
-
-# Initialize mapper with localized strings
-mapper = ModelMapper(
-    factory=factory,
-    addon_base=platform.get_addon_base_url(),
-    blocked_label=platform.get_localized_string(30902),
-    preview_label=platform.get_localized_string(30903),
-    followers_label=platform.get_localized_string(30904),
-    likes_label=platform.get_localized_string(30905)
-)
-
-# Initialize UI layer
-listItems = Items(platform, factory, mapper, search_history)
+# Services are built on first use, so each route only pays for what it needs
+container = Container()
+router = Router()
 
 
 def run():
@@ -65,152 +21,228 @@ def run():
     path = url.path
     handle = int(sys.argv[1])
     args = urllib.parse.parse_qs(sys.argv[2][1:])
-    platform.set_content(handle, "songs")
-
-    if path == PATH_ROOT:
-        action = args.get("action", None)
-        if action is None:
-            items = listItems.root()
-            platform.add_directory_items(handle, items)
-            platform.end_of_directory(handle)
-        elif "call" in action:
-            collection = listItems.from_collection(api.call(args.get("call")[0]))
-            platform.add_directory_items(handle, collection)
-            platform.end_of_directory(handle)
-        elif "settings" in action:
-            platform.open_settings()
-        else:
-            logger.error("Invalid root action")
-
-    elif path == PATH_CHARTS:
-        action = args.get("action", [None])[0]
-        genre = args.get("genre", ["soundcloud:genres:all-music"])[0]
-        if action is None:
-            items = listItems.charts()
-            platform.add_directory_items(handle, items)
-            platform.end_of_directory(handle)
-        else:
-            api_result = api.charts({"kind": action, "genre": genre, "limit": 50})
-            collection = listItems.from_collection(api_result)
-            platform.add_directory_items(handle, collection)
-            platform.end_of_directory(handle)
-
-    elif path == PATH_DISCOVER:
-        selection = args.get("selection", [None])[0]
-        collection = listItems.from_collection(api.discover(selection))
-        platform.add_directory_items(handle, collection)
-        platform.end_of_directory(handle)
-
-    elif path == PATH_PLAY:
-        # Public params
-        track_id = args.get("track_id", [None])[0]
-        playlist_id = args.get("playlist_id", [None])[0]
-        url_param = args.get("url", [None])[0]
-
-        # Public legacy params (@deprecated)
-        audio_id_legacy = args.get("audio_id", [None])[0]
-        track_id = audio_id_legacy if audio_id_legacy else track_id
-
-        # Private params
-        media_url = args.get("media_url", [None])[0]
-
-        if media_url:
-            resolved_url = api.resolve_media_url(media_url)
-            listitem = factory.create_list_item(label="")
-            factory.set_item_path(listitem, resolved_url)
-            platform.set_resolved_url(handle, succeeded=True, listitem=listitem)
-        elif track_id:
-            collection = listItems.from_collection(api.resolve_id(track_id))
-            playlist = platform.create_music_playlist()
-            resolve_list_item(handle, collection[0][1], api, factory, platform)
-            playlist.add(url=collection[0][0], listitem=collection[0][1])
-        elif playlist_id:
-            call = f"/playlists/{playlist_id}"
-            collection = listItems.from_collection(api.call(call))
-            playlist = platform.create_music_playlist()
-            for item in collection:
-                resolve_list_item(handle, item[1], api, factory, platform)
-                playlist.add(url=item[0], listitem=item[1])
-        elif url_param:
-            collection = listItems.from_collection(api.resolve_url(url_param))
-            playlist = platform.create_music_playlist()
-            for item in collection:
-                resolve_list_item(handle, item[1], api, factory, platform)
-                playlist.add(url=item[0], listitem=item[1])
-        else:
-            logger.error("Invalid play param")
-
-    elif path == PATH_SEARCH:
-        action = args.get("action", None)
-        query = args.get("query", [""])[0]
-
-        if action and "remove" in action:
-            search_history.remove(query)
-            platform.execute_builtin("Container.Refresh")
-        elif action and "clear" in action:
-            search_history.clear()
-            platform.execute_builtin("Container.Refresh")
-
-        if query:
-            if action is None:
-                search(handle, query, listItems, api, platform)
-            elif "people" in action:
-                platform.set_content(handle, "artists")
-                collection = listItems.from_collection(api.search(query, "users"))
-                platform.add_directory_items(handle, collection)
-                platform.end_of_directory(handle)
-            elif "albums" in action:
-                platform.set_content(handle, "albums")
-                collection = listItems.from_collection(api.search(query, "albums"))
-                platform.add_directory_items(handle, collection)
-                platform.end_of_directory(handle)
-            elif "playlists" in action:
-                platform.set_content(handle, "albums")
-                collection = listItems.from_collection(
-                    api.search(query, "playlists_without_albums")
-                )
-                platform.add_directory_items(handle, collection)
-                platform.end_of_directory(handle)
-            else:
-                logger.error("Invalid search action")
-        else:
-            if action is None:
-                items = listItems.search()
-                platform.add_directory_items(handle, items)
-                platform.end_of_directory(handle)
-            elif "new" in action:
-                query = platform.input_dialog(platform.get_localized_string(30101))
-                if query:
-                    search_history.add(query)
-                    search(handle, query, listItems, api, platform)
-            else:
-                logger.error("Invalid search action")
-
-    # Legacy search query used by Chorus2 (@deprecated)
-    elif path == PATH_SEARCH_LEGACY:
-        query = args.get("q", [""])[0]
-        collection = listItems.from_collection(api.search(query))
-        platform.add_directory_items(handle, collection)
-        platform.end_of_directory(handle)
-
-    elif path == PATH_USER:
-        user_id = args.get("id")[0]
-        default_action = args.get("call")[0]
-        if user_id:
-            items = listItems.user(user_id)
-            collection = listItems.from_collection(api.call(default_action))
-            platform.add_directory_items(handle, items)
-            platform.add_directory_items(handle, collection)
-            platform.end_of_directory(handle)
-        else:
-            logger.error("Invalid user action")
-
-    elif path == PATH_SETTINGS_CACHE_CLEAR:
-        vfs_cache.destroy()
-        platform.show_ok_dialog("SoundCloud", platform.get_localized_string(30501))
+    container.platform.set_content(handle, "songs")
+
+    if not router.dispatch(path, handle, args):
+        container.logger.error(f"No route for {path} {args.get('action')}")
+
+    flush_metrics()
+
+
+@router.use
+def time_route(route, call_next):
+    """Record per-route timings if metrics are enabled."""
+    if container.settings.get_bool("metrics.enabled"):
+        RouteTimer(container.metrics, container.logger)(route, call_next)
+    else:
+        call_next()
+
+
+@router.route(PATH_ROOT, action=None)
+def root(handle, args):
+    container.platform.add_directory_items(handle, container.items.root())
+    container.platform.end_of_directory(handle)
+
+
+@router.route(PATH_ROOT, action="call")
+def root_call(handle, args):
+    api_result = container.api.call(args.get("call")[0])
+    collection = container.items.from_collection(api_result)
+    container.platform.add_directory_items(handle, collection)
+    container.platform.end_of_directory(handle)
+    prefetch(api_result)
+
+
+@router.route(PATH_ROOT, action="settings")
+def root_settings(handle, args):
+    container.platform.open_settings()
+
+
+@router.route(PATH_CHARTS, action=None)
+def charts(handle, args):
+    container.platform.add_directory_items(handle, container.items.charts())
+    container.platform.end_of_directory(handle)
+
+
+@router.route(PATH_CHARTS)
+def charts_kind(handle, args):
+    action = args.get("action")[0]
+    genre = args.get("genre", ["soundcloud:genres:all-music"])[0]
+    api_result = container.api.charts({"kind": action, "genre": genre, "limit": 50})
+    collection = container.items.from_collection(api_result)
+    container.platform.add_directory_items(handle, collection)
+    container.platform.end_of_directory(handle)
+
 
+@router.route(PATH_DISCOVER)
+def discover(handle, args):
+    selection = args.get("selection", [None])[0]
+    collection = container.items.from_collection(container.api.discover(selection))
+    container.platform.add_directory_items(handle, collection)
+    container.platform.end_of_directory(handle)
+
+
+@router.route(PATH_PLAY)
+def play(handle, args):
+    platform = container.platform
+
+    # Public params
+    track_id = args.get("track_id", [None])[0]
+    playlist_id = args.get("playlist_id", [None])[0]
+    url_param = args.get("url", [None])[0]
+
+    # Public legacy params (@deprecated)
+    audio_id_legacy = args.get("audio_id", [None])[0]
+    track_id = audio_id_legacy if audio_id_legacy else track_id
+
+    # Private params
+    media_url = args.get("media_url", [None])[0]
+
+    if media_url:
+        resolved_url = container.api.resolve_media_url(media_url)
+        listitem = container.factory.create_list_item(label="")
+        container.factory.set_item_path(listitem, resolved_url)
+        platform.set_resolved_url(handle, succeeded=True, listitem=listitem)
+    elif track_id:
+        collection = container.items.from_collection(container.api.resolve_id(track_id))
+        enqueue(handle, collection[:1], platform)
+    elif playlist_id:
+        call = f"/playlists/{playlist_id}"
+        enqueue(handle, container.items.from_collection(container.api.call(call)), platform)
+    elif url_param:
+        collection = container.items.from_collection(container.api.resolve_url(url_param))
+        enqueue(handle, collection, platform)
+    else:
+        container.logger.error("Invalid play param")
+
+
+@router.route(PATH_SEARCH, action=None)
+def search_menu(handle, args):
+    query = args.get("query", [""])[0]
+    if query:
+        search(handle, query, container.items, container.api, container.platform)
     else:
-        logger.error("Path not found")
+        container.platform.add_directory_items(handle, container.items.search())
+        container.platform.end_of_directory(handle)
+
+
+@router.route(PATH_SEARCH, action="new")
+def search_new(handle, args):
+    platform = container.platform
+    query = platform.input_dialog(platform.get_localized_string(30101))
+    if query:
+        container.search_history.add(query)
+        search(handle, query, container.items, container.api, platform)
+
+
+@router.route(PATH_SEARCH, action="people")
+def search_people(handle, args):
+    search_kind(handle, args, "artists", "users")
+
+
+@router.route(PATH_SEARCH, action="albums")
+def search_albums(handle, args):
+    search_kind(handle, args, "albums", "albums")
+
+
+@router.route(PATH_SEARCH, action="playlists")
+def search_playlists(handle, args):
+    search_kind(handle, args, "albums", "playlists_without_albums")
+
+
+@router.route(PATH_SEARCH, action="offline")
+def search_offline(handle, args):
+    query = args.get("query", [""])[0]
+    if not query:
+        platform = container.platform
+        query = platform.input_dialog(platform.get_localized_string(30202))
+    if query:
+        collection = container.items.from_collection(offline_search(query))
+        container.platform.add_directory_items(handle, collection)
+        container.platform.end_of_directory(handle)
+
+
+@router.route(PATH_SEARCH, action="remove")
+def search_remove(handle, args):
+    container.search_history.remove(args.get("query", [""])[0])
+    container.platform.execute_builtin("Container.Refresh")
+
+
+@router.route(PATH_SEARCH, action="clear")
+def search_clear(handle, args):
+    container.search_history.clear()
+    container.platform.execute_builtin("Container.Refresh")
+
+
+# Legacy search query used by Chorus2 (@deprecated)
+@router.route(PATH_SEARCH_LEGACY)
+def search_legacy(handle, args):
+    query = args.get("q", [""])[0]
+    collection = container.items.from_collection(container.api.search(query))
+    container.platform.add_directory_items(handle, collection)
+    container.platform.end_of_directory(handle)
+
+
+@router.route(PATH_USER)
+def user(handle, args):
+    user_id = args.get("id")[0]
+    default_action = args.get("call")[0]
+    if user_id:
+        items = container.items.user(user_id)
+        api_result = container.api.call(default_action)
+        collection = container.items.from_collection(api_result)
+        container.platform.add_directory_items(handle, items)
+        container.platform.add_directory_items(handle, collection)
+        container.platform.end_of_directory(handle)
+        prefetch(api_result)
+    else:
+        container.logger.error("Invalid user action")
+
+
+@router.route(PATH_SETTINGS_CACHE_CLEAR)
+def settings_cache_clear(handle, args):
+    platform = container.platform
+    container.cache.clear()
+    if container.search_index:
+        container.search_index.clear()
+
+    # The backend service keeps its own memory cache, which would serve the cleared entries
+    from resources.lib.backend.client import BackendClient
+    if isinstance(container.api, BackendClient):
+        container.api.reset()
+    platform.show_ok_dialog("SoundCloud", platform.get_localized_string(30501))
+
+
+@router.route(PATH_SETTINGS_METRICS)
+def settings_metrics(handle, args):
+    from resources.lib.kodi.diagnostics import format_metrics
+    platform = container.platform
+    platform.show_text_dialog(
+        platform.get_localized_string(30090), format_metrics(container.metrics.snapshot())
+    )
+
+
+@router.route(PATH_SETTINGS_METRICS_RESET)
+def settings_metrics_reset(handle, args):
+    platform = container.platform
+    container.metrics.reset()
+    platform.show_ok_dialog("SoundCloud", platform.get_localized_string(30502))
+
+
+def enqueue(handle, collection, platform):
+    """
+    Start the first track right away and enqueue the others with their plugin URLs,
+    they are resolved by the media_url branch of the play route when their turn comes.
+    """
+    playlist = platform.create_music_playlist()
+    started = False
+    for url, list_item, is_folder in collection:
+        if is_folder:
+            continue  # E.g. the "next page" item
+        if not started:
+            resolve_list_item(handle, list_item, container.api, container.factory, platform)
+            started = True
+        playlist.add(url=url, listitem=list_item)
 
 
 def resolve_list_item(handle, list_item, api, factory, platform):
@@ -223,8 +255,66 @@ def resolve_list_item(handle, list_item, api, factory, platform):
 
 def search(handle, query, listItems, api, platform):
     """Handle search functionality."""
+    if container.settings.get_bool("search.fan_out"):
+        api.search_fan_out(query)
+
     search_options = listItems.search_sub(query)
-    collection = listItems.from_collection(api.search(query))
+    try:
+        api_result = api.search(query)
+    except OSError as e:
+        # E.g. a flaky connection, the local index still knows what has been seen before
+        container.logger.warning(f"Search failed, showing offline results: {e}")
+        api_result = offline_search(query)
+    collection = listItems.from_collection(api_result)
     platform.add_directory_items(handle, search_options)
     platform.add_directory_items(handle, collection)
     platform.end_of_directory(handle)
+    prefetch(api_result)
+
+
+def search_kind(handle, args, content_type, kind):
+    """Handle the search sub-menus (people, albums, playlists)."""
+    query = args.get("query", [""])[0]
+    if not query:
+        container.logger.error("Invalid search action")
+        return
+
+    container.platform.set_content(handle, content_type)
+    collection = container.items.from_collection(container.api.search(query, kind))
+    container.platform.add_directory_items(handle, collection)
+    container.platform.end_of_directory(handle)
+
+
+def offline_search(query, limit=50):
+    """Search the local index of seen tracks, users and playlists."""
+    from resources.lib.soundcloud.api_collection import ApiCollection
+
+    collection = ApiCollection()
+    collection.items = container.search_index.search(query, limit) if container.search_index else []
+    collection.next_href = None
+    return collection
+
+
+def flush_metrics():
+    """Persist metrics once background work (revalidation, prefetch) has finished."""
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and not thread.daemon:
+            thread.join()
+    if container.is_built("metrics"):
+        container.metrics.flush()
+
+
+def prefetch(api_result):
+    """Load the next pages into the cache once the listing has been rendered."""
+    if not container.settings.get_bool("prefetch.enabled"):
+        return
+
+    from resources.lib.soundcloud.prefetcher import Prefetcher
+
+    prefetcher = Prefetcher(
+        container.api,
+        container.logger,
+        depth=container.settings.get_int("prefetch.depth", 1),
+        max_bytes=container.settings.get_int("prefetch.size") * 1024
+    )
+    prefetcher.start(api_result.next_href)
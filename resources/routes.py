@@ -5,4 +5,6 @@ PATH_PLAY = "/play/"
 PATH_SEARCH = "/search/"
 PATH_SEARCH_LEGACY = "/search/query/"
 PATH_SETTINGS_CACHE_CLEAR = "/settings/cache/clear/"
+PATH_SETTINGS_METRICS = "/settings/metrics/"
+PATH_SETTINGS_METRICS_RESET = "/settings/metrics/reset/"
 PATH_USER = "/user/"
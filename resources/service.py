@@ -0,0 +1,47 @@
+"""Service entry point - composition root for background tasks."""
+from resources.lib.backend.server import BackendServer
+from resources.lib.kodi.cache_janitor import CacheJanitor
+from resources.lib.kodi.container import Container
+
+# Import XBMC only for the service loop primitives (minimal usage at composition root)
+import xbmc
+
+
+class ServiceMonitor(xbmc.Monitor):
+    """Monitor that forwards settings changes to a callback."""
+
+    def __init__(self, on_settings_changed):
+        super().__init__()
+        self._on_settings_changed = on_settings_changed
+
+    def onSettingsChanged(self):
+        self._on_settings_changed()
+
+
+def run():
+    """Main service entry point."""
+    container = Container()
+    backend = BackendServer(Container, container.vfs, container.logger)
+
+    def on_settings_changed():
+        # Settings are read once per container, so the warm state has to be rebuilt
+        container.settings.invalidate()
+        backend.reset()
+        configure_backend(Container(), backend)
+
+    monitor = ServiceMonitor(on_settings_changed)
+    configure_backend(container, backend)
+
+    try:
+        CacheJanitor(container.cache, container.logger, monitor, xbmc.Player()).run()
+    finally:
+        backend.stop()
+
+
+def configure_backend(container, backend):
+    """Start or stop the backend server according to the settings."""
+    enabled = container.settings.get_bool("service.backend")
+    if enabled and not backend.running:
+        backend.start()
+    elif not enabled and backend.running:
+        backend.stop()
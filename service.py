@@ -0,0 +1,3 @@
+from resources import service
+
+service.run()
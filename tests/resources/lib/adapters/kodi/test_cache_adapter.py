@@ -0,0 +1,164 @@
+import os
+import tempfile
+import time
+from unittest import mock, TestCase
+from resources.lib.adapters import cache_codec
+from resources.lib.adapters.kodi.cache_adapter import KodiCacheAdapter
+from resources.lib.ports.filesystem import IFileSystem
+
+
+class TemporaryFileSystem(IFileSystem):
+    """IFileSystem on a local directory, in place of xbmcvfs."""
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+
+    def _path(self, filename):
+        return os.path.join(self.root_path, filename)
+
+    def read(self, filename):
+        data = self.read_bytes(filename)
+        return None if data is None else data.decode()
+
+    def write(self, filename, content):
+        return self.write_bytes(filename, content.encode())
+
+    def read_bytes(self, filename, size=None):
+        if not os.path.exists(self._path(filename)):
+            return None
+        with open(self._path(filename), "rb") as file:
+            return file.read(size or -1)
+
+    def write_bytes(self, filename, content):
+        with open(self._path(filename), "wb") as file:
+            file.write(content)
+        return self._path(filename)
+
+    def write_bytes_at(self, filename, offset, content):
+        with open(self._path(filename), "r+b") as file:
+            file.seek(offset)
+            file.write(content)
+        return True
+
+    def append(self, filename, content):
+        with open(self._path(filename), "a") as file:
+            file.write(content)
+        return True
+
+    def delete(self, filename):
+        os.remove(self._path(filename))
+        return True
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def get_mtime(self, filename):
+        return int(os.stat(self._path(filename)).st_mtime)
+
+    def get_atime(self, filename):
+        return int(os.stat(self._path(filename)).st_atime)
+
+    def set_atime(self, filename):
+        os.utime(self._path(filename), (time.time(), os.stat(self._path(filename)).st_mtime))
+        return True
+
+    def get_size(self, filename):
+        return os.stat(self._path(filename)).st_size
+
+    def list_files(self):
+        return os.listdir(self.root_path)
+
+    def touch(self, filename):
+        os.utime(self._path(filename), None)
+        return True
+
+    def destroy(self):
+        for filename in self.list_files():
+            self.delete(filename)
+
+
+class KodiCacheAdapterTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filesystem = TemporaryFileSystem(self.directory.name)
+        self.cache = KodiCacheAdapter(None, self.filesystem)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _set_atime(self, filename, atime):
+        path = os.path.join(self.directory.name, filename)
+        os.utime(path, (atime, os.stat(path).st_mtime))
+
+    @mock.patch("time.time")
+    def test_freshness_from_header(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("foo", "bar", ttl=5)
+        self.cache.add("forever", "bar")
+
+        mock_time.return_value += 6 * 60
+        self.assertIsNone(self.cache.get("foo"))
+        self.assertEqual(self.cache.get_stale("foo", max_stale=5), ("bar", True))
+        self.assertEqual(self.cache.get("foo", 10), "bar")
+        self.assertEqual(self.cache.get("forever"), "bar")
+        self.assertIsNone(self.cache.get("missing"))
+
+    def test_compressed_entries(self):
+        data = "foo" * 1000
+        self.cache.add("foo", data)
+
+        self.assertLess(self.filesystem.get_size("foo"), len(data))
+        self.assertEqual(self.cache.get("foo"), data)
+
+    def test_plain_entries_use_mtime(self):
+        self.filesystem.write("foo", "bar")
+        self.assertEqual(self.cache.get("foo"), "bar")
+
+        path = os.path.join(self.directory.name, "foo")
+        os.utime(path, (time.time(), time.time() - 61 * 60))
+        self.assertIsNone(self.cache.get("foo"))
+
+    @mock.patch("time.time")
+    def test_touch_in_place(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("foo", "bar", ttl=5)
+        blob = self.filesystem.read_bytes("foo")
+
+        mock_time.return_value += 6 * 60
+        self.assertTrue(self.cache.touch("foo"))
+
+        touched = self.filesystem.read_bytes("foo")
+        self.assertEqual(len(touched), len(blob))
+        self.assertEqual(cache_codec.decode_header(touched).written, mock_time.return_value)
+        self.assertEqual(self.cache.get("foo"), "bar")
+
+    @mock.patch("time.time")
+    def test_purge(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("expired", "bar", ttl=5, grace=5)
+        self.cache.add("stale", "bar", ttl=10, grace=5)
+        self.cache.add("no-grace", "bar", ttl=10)
+        self.cache.add("forever", "bar")
+
+        mock_time.return_value += 12 * 60
+        self.assertEqual(self.cache.purge(throttle=lambda: False), 0)
+        self.assertEqual(self.cache.purge(), 2)
+        self.assertEqual(sorted(self.filesystem.list_files()), ["forever", "stale"])
+
+    def test_eviction(self):
+        entry_size = len(cache_codec.encode("1234"))
+        self.cache = KodiCacheAdapter(
+            None, self.filesystem, max_bytes=3 * entry_size, pinned=("pinned",)
+        )
+        for atime, filename in enumerate(("pinned", "foo", "bar", "baz"), start=1000000):
+            self.cache.add(filename, "1234")
+            self._set_atime(filename, atime)
+        self.assertIsNotNone(self.cache.get("foo"))  # Marks "foo" as recently used
+
+        self.assertEqual(len(self.filesystem.list_files()), 4)  # Adding does not evict
+        self.cache.compact()
+
+        self.assertIsNotNone(self.cache.get("pinned"))
+        self.assertIsNotNone(self.cache.get("foo"))
+        self.assertIsNone(self.cache.get("bar"))
+        self.assertIsNotNone(self.cache.get("baz"))
@@ -0,0 +1,44 @@
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.adapters.kodi.metrics_adapter import KodiMetricsAdapter
+
+
+class KodiMetricsAdapterTestCase(TestCase):
+    def setUp(self):
+        self.files = {}
+        self.filesystem = MagicMock()
+        self.filesystem.read.side_effect = lambda filename: self.files.get(filename)
+        self.filesystem.write.side_effect = lambda filename, content: self.files.update({filename: content})
+        self.metrics = KodiMetricsAdapter(self.filesystem)
+
+    def test_counters_accumulate_across_flushes(self):
+        self.metrics.increment("cache.hit")
+        self.metrics.flush()
+        self.metrics.increment("cache.hit", 2)
+        self.metrics.flush()
+
+        self.assertEqual(json.loads(self.files["metrics.json"])["counters"], {"cache.hit": 3})
+
+    def test_histogram(self):
+        self.metrics.observe("http.latency /tracks", 40)
+        self.metrics.observe("http.latency /tracks", 9000)
+
+        histogram = self.metrics.snapshot()["histograms"]["http.latency /tracks"]
+        self.assertEqual(histogram["count"], 2)
+        self.assertEqual(histogram["sum"], 9040)
+        self.assertEqual(histogram["buckets"], {"50": 1, "inf": 1})
+
+    def test_disabled(self):
+        metrics = KodiMetricsAdapter(self.filesystem, enabled=False)
+        metrics.increment("cache.hit")
+        metrics.flush()
+
+        self.filesystem.write.assert_not_called()
+
+    def test_reset(self):
+        self.metrics.increment("cache.hit")
+        self.metrics.reset()
+
+        self.assertEqual(self.metrics.snapshot()["counters"], {})
+        self.filesystem.delete.assert_called_once_with("metrics.json")
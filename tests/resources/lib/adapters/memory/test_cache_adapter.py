@@ -0,0 +1,62 @@
+from unittest import mock, TestCase
+from unittest.mock import MagicMock
+from resources.lib.adapters.memory.cache_adapter import MemoryCacheAdapter
+
+
+class MemoryCacheAdapterTestCase(TestCase):
+    def setUp(self):
+        self.backend = MagicMock()
+        self.backend.get_stale.return_value = ("bar", False)
+        self.cache = MemoryCacheAdapter(self.backend, max_entries=2, max_read_age=60)
+
+    def test_read_through(self):
+        self.assertEqual(self.cache.get("foo"), "bar")
+        self.assertEqual(self.cache.get("foo"), "bar")
+
+        self.backend.get_stale.assert_called_once_with("foo", None, 0)
+
+    @mock.patch("time.time")
+    def test_expiry(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("written", "foo", ttl=5)
+        self.cache.get("read")
+
+        mock_time.return_value += 61
+        self.backend.get_stale.reset_mock()
+        self.assertEqual(self.cache.get("written"), "foo")
+        self.backend.get_stale.assert_not_called()
+        self.cache.get("read")
+        self.backend.get_stale.assert_called_once_with("read", None, 0)
+
+        mock_time.return_value += 5 * 60
+        self.backend.get_stale.return_value = (None, False)
+        self.assertIsNone(self.cache.get("written"))
+
+    def test_age_override_is_not_kept(self):
+        self.cache.get("foo", 10080)
+        self.cache.get("foo")
+
+        self.assertEqual(self.backend.get_stale.call_count, 2)
+
+    def test_stale_entries_are_not_kept(self):
+        self.backend.get_stale.return_value = ("bar", True)
+
+        self.assertEqual(self.cache.get_stale("foo", 60, 60), ("bar", True))
+        self.assertEqual(self.cache.get_stale("foo", 60, 60), ("bar", True))
+        self.assertEqual(self.backend.get_stale.call_count, 2)
+
+    def test_bounded(self):
+        self.cache.add("a", "1")
+        self.cache.add("b", "2")
+        self.cache.add("c", "3")
+
+        self.cache.get("a")
+        self.backend.get_stale.assert_called_once_with("a", None, 0)
+
+    def test_clear(self):
+        self.cache.add("foo", "bar")
+        self.cache.clear()
+        self.cache.get("foo")
+
+        self.backend.clear.assert_called_once()
+        self.backend.get_stale.assert_called_once()
@@ -0,0 +1,119 @@
+import sqlite3
+from unittest import mock, TestCase
+from resources.lib.adapters import cache_codec
+from resources.lib.adapters.sqlite.cache_adapter import SqliteCacheAdapter
+
+
+class SqliteCacheAdapterTestCase(TestCase):
+    def setUp(self):
+        self.cache = SqliteCacheAdapter(":memory:")
+
+    def test_add_get(self):
+        self.assertEqual(self.cache.add("foo", "bar"), "foo")
+        self.assertEqual(self.cache.get("foo"), "bar")
+        self.assertIsNone(self.cache.get("baz"))
+
+    def test_compressed_entries(self):
+        data = "foo" * 1000
+        self.cache.add("foo", data)
+
+        self.assertEqual(self.cache.get("foo"), data)
+
+    @mock.patch("time.time")
+    def test_expiry(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("foo", "bar")
+
+        mock_time.return_value += 61 * 60
+        self.assertIsNone(self.cache.get("foo", 60))
+        self.assertEqual(self.cache.get_stale("foo", 60, 5), ("bar", True))
+        self.assertEqual(self.cache.get_stale("foo", 60, 0), (None, False))
+
+        self.assertTrue(self.cache.touch("foo"))
+        self.assertEqual(self.cache.get_stale("foo", 60, 5), ("bar", False))
+        self.assertFalse(self.cache.touch("baz"))
+
+    @mock.patch("time.time")
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("foo", "bar", ttl=5)
+        self.cache.add("baz", "bar")
+
+        mock_time.return_value += 6 * 60
+        self.assertIsNone(self.cache.get("foo"))
+        self.assertEqual(self.cache.get_stale("foo", max_stale=5), ("bar", True))
+        self.assertEqual(self.cache.get("foo", 10), "bar")
+        self.assertEqual(self.cache.get("baz"), "bar")
+
+        self.cache.touch("foo")
+        self.assertEqual(self.cache.get("foo"), "bar")
+
+    @mock.patch("time.time")
+    def test_purge(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.add("expired", "bar", ttl=5, grace=5)
+        self.cache.add("stale", "bar", ttl=10, grace=5)
+        self.cache.add("forever", "bar")
+
+        mock_time.return_value += 12 * 60
+        self.assertEqual(self.cache.purge(), 1)
+        self.cache.compact()
+
+        self.assertIsNone(self.cache.get("expired", 60))
+        self.assertEqual(self.cache.get_stale("stale", max_stale=5), ("bar", True))
+        self.assertEqual(self.cache.get("forever"), "bar")
+
+    def test_clear(self):
+        self.cache.add("foo", "bar")
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("foo"))
+
+    @mock.patch("time.time")
+    def test_eviction(self, mock_time):
+        mock_time.return_value = 1000000
+        entry_size = len(cache_codec.encode("1234"))
+        self.cache = SqliteCacheAdapter(":memory:", max_bytes=3 * entry_size, pinned=("pinned",))
+        self.cache.add("pinned", "1234")
+        mock_time.return_value += 1
+        self.cache.add("foo", "1234")
+        mock_time.return_value += 1
+        self.cache.add("bar", "1234")
+        mock_time.return_value += SqliteCacheAdapter.access_resolution + 1
+        self.assertIsNotNone(self.cache.get("foo"))  # Marks "foo" as recently used
+        mock_time.return_value += 1
+        self.cache.add("baz", "1234")
+
+        self.assertIsNotNone(self.cache.get("pinned"))
+        self.assertIsNotNone(self.cache.get("foo"))
+        self.assertIsNone(self.cache.get("bar"))
+        self.assertIsNotNone(self.cache.get("baz"))
+
+    def test_eviction_counts_replaced_entries_once(self):
+        entry_size = len(cache_codec.encode("1234"))
+        self.cache = SqliteCacheAdapter(":memory:", max_bytes=3 * entry_size)
+        for _ in range(10):
+            self.cache.add("foo", "1234")
+        self.cache.add("bar", "1234")
+        self.cache.add("baz", "1234")
+
+        self.assertIsNotNone(self.cache.get("foo"))
+        self.assertIsNotNone(self.cache.get("bar"))
+        self.cache.clear()
+        self.cache.add("foo", "1234")
+        self.assertIsNotNone(self.cache.get("foo"))
+
+    def test_read_errors_are_misses(self):
+        self.cache.add("foo", "bar")
+        locked = sqlite3.OperationalError("database is locked")
+        self.cache._db = mock.MagicMock(**{"execute.side_effect": locked})
+
+        self.assertEqual(self.cache.get_stale("foo"), (None, False))
+        self.assertFalse(self.cache.touch("foo"))
+
+    def test_closed_cache_misses(self):
+        self.cache.add("foo", "bar")
+        self.cache.close()
+
+        self.assertIsNone(self.cache.get("foo"))
+        self.assertIsNone(self.cache.add("foo", "bar"))
@@ -0,0 +1,63 @@
+import sqlite3
+from unittest import mock, TestCase
+from resources.lib.adapters.sqlite.search_index_adapter import SqliteSearchIndexAdapter
+from resources.lib.models.selection import Selection
+from resources.lib.models.track import Track
+from resources.lib.models.user import User
+
+
+class SqliteSearchIndexAdapterTestCase(TestCase):
+    def setUp(self):
+        self.index = SqliteSearchIndexAdapter(":memory:")
+        self.track = Track(id=1, label="Deadmau5 - Raise Your Weapon")
+        self.track.info = {"artist": "NOISIA"}
+        self.user = User(id=2, label="noisia")
+        self.index.add([self.track, self.user, Selection(id=3, label="Noisia mix")])
+
+    def test_search(self):
+        res = self.index.search("dead RAISE", 10)
+
+        self.assertEqual(len(res), 1)
+        self.assertIsInstance(res[0], Track)
+        self.assertEqual(res[0].info, {"artist": "NOISIA"})
+
+    def test_search_prefix(self):
+        res = self.index.search("noi", 10)
+
+        self.assertEqual(sorted(type(item).__name__ for item in res), ["Track", "User"])
+
+    def test_update(self):
+        self.track.label = "Deadmau5 - Raise Your Weapon (Noisia Remix)"
+        self.index.add([self.track])
+
+        self.assertEqual([item.label for item in self.index.search("remix", 10)], [self.track.label])
+        self.assertEqual(len(self.index.search("deadmau5", 10)), 1)
+
+    def test_like_fallback(self):
+        self.index._fts = False
+
+        self.assertEqual([item.label for item in self.index.search("weapon", 10)], [self.track.label])
+
+    def test_clear(self):
+        self.index.clear()
+
+        self.assertEqual(self.index.search("noisia", 10), [])
+
+    def test_failed_add_is_rolled_back(self):
+        error = sqlite3.OperationalError("database is locked")
+        with mock.patch.object(self.index, "_prune", side_effect=error):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.index.add([Track(id=4, label="Noisia - Tentacles")])
+
+        self.assertEqual(self.index.search("tentacles", 10), [])
+        self.index.add([Track(id=5, label="Noisia - Stigma")])
+        self.assertEqual([item.id for item in self.index.search("stigma", 10)], [5])
+
+    @mock.patch("time.time")
+    def test_prune_least_recently_seen(self, mock_time):
+        self.index = SqliteSearchIndexAdapter(":memory:", max_items=2)
+        for seen, id in enumerate((1, 2, 3), start=1000000):
+            mock_time.return_value = seen
+            self.index.add([Track(id=id, label=f"Noisia {id}")])
+
+        self.assertEqual(sorted(item.id for item in self.index.search("noisia", 10)), [2, 3])
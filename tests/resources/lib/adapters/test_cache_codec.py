@@ -0,0 +1,40 @@
+import json
+from unittest import TestCase
+from resources.lib.adapters import cache_codec
+
+
+class CacheCodecTestCase(TestCase):
+    def test_header(self):
+        blob = cache_codec.encode("client-id", 1440, "text/plain", 1760000000, grace=60)
+        header = cache_codec.decode_header(blob[:cache_codec.HEADER_SIZE])
+
+        self.assertEqual(header.written, 1760000000)
+        self.assertEqual(header.ttl, 1440)
+        self.assertEqual(header.grace, 60)
+        self.assertEqual(header.content_type, "text/plain")
+        self.assertEqual(header.encoding, cache_codec.ENCODING_IDENTITY)
+        self.assertEqual(cache_codec.decode(blob), "client-id")
+        self.assertLess(blob.find(b"\n"), cache_codec.HEADER_SIZE)
+
+    def test_written_can_be_patched(self):
+        blob = bytearray(cache_codec.encode("foo", written=1760000000))
+        offset = cache_codec.WRITTEN_OFFSET
+        blob[offset:offset + cache_codec.WRITTEN_SIZE] = cache_codec.encode_written(1770000000)
+
+        self.assertEqual(cache_codec.decode_header(blob).written, 1770000000)
+        self.assertEqual(cache_codec.decode(blob), "foo")
+
+    def test_compression(self):
+        with open("./tests/mocks/api_v2_search_albums.json") as f:
+            data = json.dumps(json.loads(f.read()))
+
+        blob = cache_codec.encode(data)
+
+        self.assertEqual(cache_codec.decode_header(blob).encoding, cache_codec.ENCODING_ZLIB)
+        self.assertLess(len(blob), len(data) / 2)
+        self.assertEqual(cache_codec.decode(blob), data)
+
+    def test_legacy_entries(self):
+        self.assertIsNone(cache_codec.decode_header(b'{"collection": []}'))
+        self.assertEqual(cache_codec.decode(b'{"collection": []}'), '{"collection": []}')
+        self.assertEqual(cache_codec.decode('{"collection": []}'), '{"collection": []}')
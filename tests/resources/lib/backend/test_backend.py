@@ -0,0 +1,64 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.backend.client import BackendClient, BackendNetworkError
+from resources.lib.backend.server import BackendServer
+
+
+class BackendTestCase(TestCase):
+    def setUp(self):
+        self.container = MagicMock()
+        self.container.local_api.resolve_media_url.return_value = "https://example.com/stream.mp3"
+        self.vfs = MagicMock()
+        self.server = BackendServer(lambda: self.container, self.vfs, MagicMock())
+        self.server.start()
+        self.endpoint = self.vfs.save_obj_to_json.call_args[0][1]
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_call(self):
+        client = BackendClient(self.endpoint, MagicMock(), MagicMock())
+
+        self.assertEqual(client.resolve_media_url("/media/1"), "https://example.com/stream.mp3")
+        self.container.local_api.resolve_media_url.assert_called_once_with("/media/1")
+
+    def test_invalid_token(self):
+        client = BackendClient({**self.endpoint, "token": "foo"}, MagicMock(), MagicMock())
+
+        self.assertRaises(RuntimeError, client.resolve_media_url, "/media/1")
+        self.container.local_api.resolve_media_url.assert_not_called()
+
+    def test_fallback(self):
+        self.server.stop()
+        fallback = MagicMock(**{"resolve_media_url.return_value": "local"})
+        client = BackendClient(self.endpoint, lambda: fallback, MagicMock())
+
+        self.assertEqual(client.resolve_media_url("/media/1"), "local")
+        self.vfs.delete.assert_called_once_with("backend.json")
+
+    def test_reset_closes_previous_container(self):
+        previous = self.container
+        self.container = MagicMock()
+        self.server.reset()
+
+        previous.close.assert_called_once()
+        self.container.close.assert_not_called()
+
+    def test_reset_rpc(self):
+        previous = self.container
+        self.container = MagicMock(**{"local_api.resolve_media_url.return_value": "new"})
+        client = BackendClient(self.endpoint, MagicMock(), MagicMock())
+
+        client.reset()
+
+        previous.close.assert_called_once()
+        self.assertEqual(client.resolve_media_url("/media/1"), "new")
+
+    def test_network_error(self):
+        self.container.local_api.search.side_effect = ConnectionError("offline")
+        self.container.local_api.charts.side_effect = ValueError("invalid")
+        client = BackendClient(self.endpoint, MagicMock(), MagicMock())
+
+        # Network errors stay OSErrors, so callers can fall back, e.g. to offline results
+        self.assertRaises(BackendNetworkError, client.search, "foo")
+        self.assertRaises(RuntimeError, client.charts, {})
@@ -0,0 +1,24 @@
+import json
+from unittest import TestCase
+from resources.lib.backend.protocol import from_wire, to_wire
+from resources.lib.models.track import Track
+from resources.lib.soundcloud.api_collection import ApiCollection
+
+
+class ProtocolTestCase(TestCase):
+    def test_collection_round_trip(self):
+        track = Track(id=1, label="Foo")
+        track.info = {"artist": "Bar"}
+        collection = ApiCollection()
+        collection.items = [track]
+        collection.unresolved = [2]
+        collection.next_href = "/next"
+
+        res = from_wire(json.loads(json.dumps(to_wire((collection, 100)))))
+
+        self.assertEqual(res[1], 100)
+        self.assertEqual(res[0].next_href, "/next")
+        self.assertEqual(res[0].unresolved, [2])
+        self.assertIsInstance(res[0].items[0], Track)
+        self.assertEqual(res[0].items[0].label, "Foo")
+        self.assertEqual(res[0].items[0].info, {"artist": "Bar"})
@@ -0,0 +1,27 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.kodi.cache_janitor import CacheJanitor
+
+
+class CacheJanitorTestCase(TestCase):
+    def setUp(self):
+        self.cache = MagicMock(**{"purge.return_value": 3})
+        self.monitor = MagicMock(**{"waitForAbort.return_value": False, "abortRequested.return_value": False})
+        self.player = MagicMock(**{"isPlaying.return_value": False})
+        self.janitor = CacheJanitor(self.cache, MagicMock(), self.monitor, self.player)
+
+    def test_sweep(self):
+        self.assertEqual(self.janitor.sweep(), 3)
+        self.cache.purge.assert_called_once_with(self.janitor._throttle)
+        self.cache.compact.assert_called_once()
+
+    def test_run_skips_during_playback(self):
+        self.monitor.waitForAbort.side_effect = [False, True]
+        self.player.isPlaying.return_value = True
+        self.janitor.run()
+        self.cache.purge.assert_not_called()
+
+    def test_throttle_stops_on_playback(self):
+        self.assertTrue(self.janitor._throttle())
+        self.player.isPlaying.return_value = True
+        self.assertFalse(self.janitor._throttle())
@@ -0,0 +1,46 @@
+import sys
+from unittest import TestCase
+from unittest.mock import MagicMock
+sys.modules["xbmc"] = MagicMock()
+sys.modules["xbmcaddon"] = MagicMock()
+sys.modules["xbmcgui"] = MagicMock()
+sys.modules["xbmcplugin"] = MagicMock()
+sys.modules["xbmcvfs"] = MagicMock()
+from resources.lib.kodi.container import Container
+
+
+class ContainerTestCase(TestCase):
+    def test_services_are_built_on_first_use(self):
+        container = Container()
+        container.items.root()
+
+        self.assertTrue(container.is_built("items"))
+        self.assertFalse(container.is_built("api"))
+        self.assertFalse(container.is_built("cache"))
+        self.assertFalse(container.is_built("http"))
+
+    def test_services_are_built_once(self):
+        container = Container()
+
+        self.assertIs(container.settings, container.settings)
+
+    def test_search_index_is_built_on_first_mapped_collection(self):
+        container = Container()
+        container.__dict__["settings"] = MagicMock(**{"get_int.return_value": 20})
+
+        api = container.local_api
+        self.assertFalse(container.is_built("search_index"))
+
+        container.__dict__["search_index"] = MagicMock()
+        api._map_json_to_collection({"collection": []})
+        container.search_index.add.assert_called_once_with([])
+
+    def test_close_releases_built_services(self):
+        container = Container()
+        container.__dict__["http"] = MagicMock()
+        container.__dict__["search_index"] = None
+
+        container.close()
+
+        container.http.close.assert_called_once()
+        self.assertFalse(container.is_built("cache_adapter"))
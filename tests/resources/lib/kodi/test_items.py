@@ -0,0 +1,25 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.kodi.items import Items
+
+
+class ItemsTestCase(TestCase):
+    def setUp(self):
+        self.platform = MagicMock()
+        self.platform.get_addon_base_url.return_value = "plugin://plugin.audio.soundcloud"
+        self.platform.get_localized_string.side_effect = lambda string_id: f"#{string_id}"
+        self.factory = MagicMock()
+        self.factory.create_list_item.side_effect = lambda label: label
+        self.items = Items(self.platform, self.factory, MagicMock(), MagicMock())
+
+    def test_root(self):
+        root = self.items.root()
+
+        self.assertEqual(root[0], ("plugin://plugin.audio.soundcloud/search/", "#30101", True))
+        self.assertEqual(root[3], ("plugin://plugin.audio.soundcloud/?action=settings", "#30108", False))
+
+    def test_user(self):
+        self.assertEqual(self.items.user(1)[0], (
+            "plugin://plugin.audio.soundcloud/?action=call&call=%2Fusers%2F1%2Falbums", "[B]#30212[/B]", True
+        ))
+
@@ -0,0 +1,49 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.kodi.router import Router, RouteTimer
+
+
+class RouterTestCase(TestCase):
+    def setUp(self):
+        self.router = Router()
+        self.menu = self.router.route("/search/", action=None)(MagicMock())
+        self.people = self.router.route("/search/", action="people")(MagicMock())
+        self.play = self.router.route("/play/")(MagicMock())
+
+    def test_dispatch_by_action(self):
+        self.assertTrue(self.router.dispatch("/search/", 1, {}))
+        self.assertTrue(self.router.dispatch("/search/", 1, {"action": ["people"]}))
+
+        self.menu.assert_called_once_with(1, {})
+        self.people.assert_called_once_with(1, {"action": ["people"]})
+
+    def test_dispatch_any_action(self):
+        self.assertTrue(self.router.dispatch("/play/", 1, {"track_id": ["1"]}))
+        self.play.assert_called_once()
+
+    def test_dispatch_unknown(self):
+        self.assertFalse(self.router.dispatch("/foo/", 1, {}))
+        self.assertFalse(self.router.dispatch("/search/", 1, {"action": ["foo"]}))
+
+    def test_middleware(self):
+        calls = []
+        self.router.use(lambda route, call_next: calls.append("outer") or call_next())
+        self.router.use(lambda route, call_next: calls.append(route.name) or call_next())
+
+        self.router.dispatch("/search/", 1, {"action": ["people"]})
+
+        self.assertEqual(calls, ["outer", "/search/?action=people"])
+        self.people.assert_called_once()
+
+    def test_route_timer(self):
+        metrics = MagicMock()
+        metrics.pending.side_effect = [
+            {"counters": {"http.requests": 1}},
+            {"counters": {"http.requests": 3, "cache.hit": 2}},
+        ]
+        self.router.use(RouteTimer(metrics, MagicMock()))
+
+        self.router.dispatch("/play/", 1, {})
+
+        metrics.observe.assert_any_call("route.http /play/", 2)
+        metrics.observe.assert_any_call("route.cache_hits /play/", 2)
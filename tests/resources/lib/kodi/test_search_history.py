@@ -0,0 +1,65 @@
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.kodi.search_history import SearchHistory
+
+
+class SearchHistoryTestCase(TestCase):
+    def setUp(self):
+        self.files = {}
+        self.vfs = MagicMock()
+        self.vfs.read.side_effect = self.files.get
+        self.vfs.write.side_effect = self.files.__setitem__
+        self.vfs.append.side_effect = lambda filename, content: \
+            self.files.__setitem__(filename, self.files.get(filename, "") + content) or True
+        self.vfs.delete.side_effect = lambda filename: self.files.pop(filename, None)
+        self.vfs.get_json_as_obj.side_effect = lambda filename: json.loads(self.files.get(filename, "{}"))
+        self.settings = MagicMock(**{"get_int.return_value": 3})
+
+    def _history(self):
+        return SearchHistory(self.settings, self.vfs)
+
+    def test_add(self):
+        history = self._history()
+        history.add("foo")
+        history.add("bar")
+        history.add(" FOO ")
+
+        self.assertEqual(self._history().get(), ["bar", "foo"])
+        self.assertEqual(len(self.files["search_history.jsonl"].splitlines()), 2)
+
+    def test_failed_append_rewrites_log(self):
+        history = self._history()
+        history.add("foo")
+        self.vfs.append.side_effect = lambda filename, content: False
+        history.add("bar")
+
+        self.assertEqual(self._history().get(), ["bar", "foo"])
+
+    def test_remove(self):
+        history = self._history()
+        history.add("foo")
+        history.add("bar")
+        history.remove("foo")
+
+        self.assertEqual(self._history().get(), ["bar"])
+
+    def test_compaction(self):
+        history = self._history()
+        for i in range(25):
+            history.add(f"query {i}")
+
+        self.assertEqual(self._history().get(), ["query 24", "query 23", "query 22"])
+        self.assertLessEqual(len(self.files["search_history.jsonl"].splitlines()), 20)
+
+    def test_lazy_loading(self):
+        self._history()
+
+        self.vfs.read.assert_not_called()
+
+    def test_migrate_legacy_file(self):
+        self.files["search_history.json"] = json.dumps({"1600000000": {"query": "foo"}, "1600000100": {"query": "bar"}})
+
+        self.assertEqual(self._history().get(), ["bar", "foo"])
+        self.assertNotIn("search_history.json", self.files)
+        self.assertIn("search_history.jsonl", self.files)
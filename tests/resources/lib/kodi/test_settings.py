@@ -0,0 +1,29 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.kodi.settings import Settings
+
+
+class SettingsTestCase(TestCase):
+    def setUp(self):
+        self.adapter = MagicMock()
+        self.adapter.get.side_effect = {"search.items.size": "20", "audio.format": "0", "foo": ""}.get
+        self.settings = Settings(self.adapter)
+
+    def test_snapshot(self):
+        for _ in range(200):
+            self.settings.get_audio_format()
+
+        self.adapter.get.assert_called_once_with("audio.format")
+
+    def test_invalidate(self):
+        self.settings.get("foo")
+        self.settings.invalidate()
+        self.settings.get("foo")
+
+        self.assertEqual(self.adapter.get.call_count, 2)
+
+    def test_typed(self):
+        self.assertEqual(self.settings.get_int("search.items.size"), 20)
+        self.assertEqual(self.settings.get_int("foo", 5), 5)
+        self.assertFalse(self.settings.get_bool("foo"))
+        self.assertEqual(self.settings.get_audio_format(), Settings.AUDIO_FORMATS["0"])
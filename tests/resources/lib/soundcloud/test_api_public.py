@@ -1,11 +1,12 @@
 from unittest import TestCase, skip
+from unittest.mock import MagicMock
 from resources.lib.soundcloud.api_public import ApiPublic
 
 
 class ApiPublicTestCase(TestCase):
 
     def setUp(self):
-        self.api = ApiPublic()
+        self.api = ApiPublic(http=MagicMock())
 
     @skip("Not implemented")
     def test_search(self):
@@ -1,5 +1,7 @@
 import json
 import sys
+import threading
+import time
 from unittest import mock, TestCase
 from unittest.mock import MagicMock, Mock, DEFAULT, ANY
 sys.modules["xbmc"] = MagicMock()
@@ -11,9 +13,23 @@ from resources.lib.soundcloud.api_v2 import ApiV2
 
 class ApiV2TestCase(TestCase):
     def setUp(self):
-        self.api = ApiV2(settings=Settings(MagicMock()), lang="en", cache=MagicMock())
+        self.api = ApiV2(
+            settings=Settings(MagicMock()),
+            lang="en",
+            cache=MagicMock(**{
+                "get.return_value": None,
+                "get_stale.return_value": (None, False)
+            }),
+            logger=MagicMock(),
+            http=MagicMock(pool_size=8),
+            metrics=MagicMock()
+        )
         self.api.settings.get = self._side_effect_settings_get
 
+    @staticmethod
+    def _revalidation_threads():
+        return [t for t in threading.enumerate() if t.name == "revalidate"]
+
     @staticmethod
     def _side_effect_do_request(*args):
         if args[0] == "/tracks":
@@ -83,6 +99,39 @@ class ApiV2TestCase(TestCase):
         self.assertEqual(res.items[1].media, "https://api-v2.soundcloud.com/media/soundcloud:tracks:23547065/e7846551-5c8e-4b93-b4f0-f94bfa7b1275/stream/progressive")
         self.assertEqual(res.items[1].thumb, "https://i1.sndcdn.com/artworks-000011681052-n1a6w6-t500x500.jpg")
 
+    def test_search_feeds_index(self):
+        self.api.index = MagicMock()
+        with open("./tests/mocks/api_v2_search_tracks.json") as f:
+            self.api._do_request = Mock(return_value=json.loads(f.read()))
+
+        res = self.api.search("foo")
+
+        self.api.index.add.assert_called_once_with(res.items)
+
+    def test_search_fan_out(self):
+        self.api._do_request = Mock(return_value={"collection": []})
+
+        for thread in self.api.search_fan_out("foo"):
+            thread.join()
+
+        requested = sorted(call[0][0] for call in self.api._do_request.call_args_list)
+        self.assertEqual(requested, ["/search/albums", "/search/playlists_without_albums", "/search/users"])
+        self.api._do_request.assert_called_with(ANY, ANY, self.api.api_cache["search"])
+
+    def test_search_fan_out_without_cache(self):
+        self.api._do_request = Mock()
+        self.api.api_cache = dict(self.api.api_cache, search=0)
+
+        self.assertEqual(self.api.search_fan_out("foo"), [])
+        self.api._do_request.assert_not_called()
+
+    def test_cache_key(self):
+        key = self.api._cache_key("/search/tracks", {"q": "Foo  Bar", "limit": 20, "client_id": "a"})
+
+        self.assertEqual(key, self.api._cache_key("/search/tracks", {"limit": 20, "q": " ｆoo bar"}))
+        self.assertNotEqual(key, self.api._cache_key("/search/tracks", {"q": "Foo Bar", "limit": 10}))
+        self.assertNotEqual(key, self.api._cache_key("/search/users", {"q": "Foo Bar", "limit": 20}))
+
     def test_search_playlists(self):
         with open("./tests/mocks/api_v2_search_playlists_without_albums.json") as f:
             mock_data = f.read()
@@ -129,6 +178,105 @@ class ApiV2TestCase(TestCase):
         self.assertEqual(res.items[2].label, "The Man I Want To Be")
         self.assertEqual(res.items[3].label, "2004 Car Commercial")
 
+    def test_playlist_hydration_keeps_order(self):
+        with open("./tests/mocks/api_v2_playlists.json") as f:
+            mock_data = json.loads(f.read())
+
+        # Move the unresolved track between two complete tracks
+        mock_data["tracks"].insert(1, mock_data["tracks"].pop())
+        # Add a track the API is not able to resolve
+        mock_data["tracks"].append({"id": 1, "kind": "track"})
+
+        self.api._do_request = Mock(return_value=mock_data)
+        self.api._do_request.side_effect = self._side_effect_do_request
+        self.api.api_limit_tracks = 1
+
+        res = self.api.call("/playlists/1")
+
+        self.assertEqual(res.items[0].label, "Rock Your Body - Justin Timberlake (Alex Dogmatic Remix)")
+        self.assertEqual(res.items[1].label, "2004 Car Commercial")
+        self.assertEqual(res.items[2].label, "Philip's Push")
+        self.assertEqual(res.items[3].label, "The Man I Want To Be")
+        self.assertEqual(len(res.items), 4)
+        self.assertEqual(res.unresolved, [1])
+
+    def test_playlist_concurrent_hydration(self):
+        with open("./tests/mocks/api_v2_discover.json") as f:
+            mock_data = f.read()
+
+        self.api._do_request = Mock(return_value=json.loads(mock_data))
+        self.api._do_request.side_effect = self._side_effect_do_request
+        self.api.api_hydration_workers = 3
+        self.api.api_limit_tracks = 1
+
+        res = self.api.discover("soundcloud:system-playlists:charts-top:all-music:at")
+
+        self.assertEqual(self.api._do_request.call_count, 4)
+        self.assertEqual(res.items[0].label, "110")
+        self.assertEqual(res.items[1].label, "THis iS thE LiFe - TEKK Remix")
+        self.assertEqual(res.items[2].label, "Expulze & Narfos - Breaking News")
+
+    @mock.patch("resources.lib.soundcloud.api_v2.ThreadPoolExecutor")
+    def test_hydration_workers_capped_at_pool_size(self, executor):
+        executor.return_value.__enter__.return_value.map.return_value = [[], [], []]
+        self.api.api_hydration_workers = 8
+        self.api.http.pool_size = 2
+
+        self.api._load_chunks([[1], [2], [3]])
+
+        executor.assert_called_once_with(max_workers=2)
+
+    def test_playlist_hydration_uses_entity_cache(self):
+        cached = {}
+        self.api.cache.get.side_effect = lambda key, age=None: cached.get(key)
+        self.api.cache.add.side_effect = lambda key, data, ttl: cached.update({key: data})
+
+        with open("./tests/mocks/api_v2_discover.json") as f:
+            mock_data = f.read()
+
+        with open("./tests/mocks/api_v2_discover_tracks.json") as f:
+            cached_track = json.loads(f.read())[1]
+        self.api.entities.add_many("track", [cached_track])
+
+        self.api._do_request = Mock(return_value=json.loads(mock_data))
+        self.api._do_request.side_effect = self._side_effect_do_request
+        self.api.discover("soundcloud:system-playlists:charts-top:all-music:at")
+
+        # Only the missing tracks are requested, and they are stored as one batch
+        self.api._do_request.assert_called_with("/tracks", {"ids": "683327426,597967971"})
+        self.assertEqual(len(cached), 3)
+
+        self.api._do_request.reset_mock()
+        res = self.api.discover("soundcloud:system-playlists:charts-top:all-music:at")
+
+        self.api._do_request.assert_called_once_with(ANY, {}, ANY, ANY)
+        self.assertEqual(res.items[0].label, "110")
+        self.assertEqual(res.items[1].label, "THis iS thE LiFe - TEKK Remix")
+        self.assertEqual(res.items[2].label, "Expulze & Narfos - Breaking News")
+
+    def test_entity_cache_with_string_ids(self):
+        cached = {}
+        self.api.cache.get.side_effect = lambda key, age=None: cached.get(key)
+        self.api.cache.add.side_effect = lambda key, data, ttl: cached.update({key: data})
+
+        with open("./tests/mocks/api_v2_tracks.json") as f:
+            self.api._do_request = Mock(return_value=json.loads(f.read()))
+        self.api.resolve_id("273627408")
+        res = self.api.resolve_id("273627408")
+
+        self.api._do_request.assert_called_once()
+        self.assertEqual(res.items[0].label, "Voodoo (Outer Edges)")
+
+        with open("./tests/mocks/api_v2_playlists.json") as f:
+            self.api._do_request = Mock(return_value=json.loads(f.read()))
+        self.api._do_request.side_effect = self._side_effect_do_request
+        self.api.call("/playlists/1")
+        self.api._do_request.reset_mock()
+        res = self.api.call("/playlists/1")
+
+        self.api._do_request.assert_not_called()
+        self.assertEqual(res.items[3].label, "2004 Car Commercial")
+
     def test_resolve_id(self):
         with open("./tests/mocks/api_v2_tracks.json") as f:
             mock_data = f.read()
@@ -180,6 +328,63 @@ class ApiV2TestCase(TestCase):
         self.assertEqual(res.items[0].label, "110")
         self.assertEqual(res.items[1].label, "THis iS thE LiFe - TEKK Remix")
 
+    def test_do_request_stale_while_revalidate(self):
+        self.api.settings.get = Mock(return_value="client-id")
+        self.api.cache.get_stale.return_value = ('{"collection": []}', True)
+        self.api.http.get.return_value.status_code = 200
+        self.api.http.get.return_value.headers = {}
+        self.api.http.get.return_value.json.return_value = {"collection": [{"id": 1}]}
+
+        res = self.api._do_request("/mixed-selections", {}, 120, 1440)
+        for thread in self._revalidation_threads():
+            thread.join()
+
+        self.assertEqual(res, {"collection": []})
+        self.api.http.get.assert_called_once()
+        self.api.cache.add.assert_called_once_with(
+            ANY, '{"collection": [{"id": 1}]}', 120, grace=1440
+        )
+
+    def test_do_request_fresh_cache_hit(self):
+        self.api.settings.get = Mock(return_value="client-id")
+        self.api.cache.get_stale.return_value = ('{"collection": []}', False)
+
+        res = self.api._do_request("/mixed-selections", {}, 120, 1440)
+
+        self.assertEqual(res, {"collection": []})
+        self.api.http.get.assert_not_called()
+        self.api.metrics.increment.assert_any_call("cache.hit")
+        self.api.metrics.increment.assert_any_call("cache.bytes_read", 18)
+
+    def test_do_request_not_modified(self):
+        self.api.settings.get = Mock(return_value="client-id")
+        self.api.cache.get.side_effect = lambda key, age=None: \
+            '{"etag": "\\"abc\\""}' if key.endswith("-validators") else '{"collection": []}'
+        self.api.http.get.return_value.status_code = 304
+
+        res = self.api._do_request("/mixed-selections", {}, 120)
+
+        self.assertEqual(res, {"collection": []})
+        self.assertEqual(self.api.http.get.call_args[1]["headers"]["If-None-Match"], '"abc"')
+        self.api.cache.touch.assert_called_once()
+        self.api.cache.add.assert_not_called()
+
+    def test_do_request_stores_validators(self):
+        self.api.settings.get = Mock(return_value="client-id")
+        self.api.http.get.return_value.status_code = 200
+        self.api.http.get.return_value.headers = {"Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}
+        self.api.http.get.return_value.json.return_value = {"collection": []}
+
+        self.api._do_request("/mixed-selections", {}, 120)
+
+        self.api.metrics.increment.assert_any_call("cache.miss")
+        self.api.metrics.observe.assert_called_once_with("http.latency /mixed-selections", ANY)
+        self.assertNotIn("If-Modified-Since", self.api.http.get.call_args[1]["headers"])
+        self.api.cache.add.assert_any_call(ANY, '{"collection": []}', 120, grace=10080)
+        self.api.cache.add.assert_called_with(
+            ANY, '{"last_modified": "Sat, 17 Oct 2026 10:00:00 GMT"}', 10080
+        )
+
     def test_charts(self):
         with open("./tests/mocks/api_v2_charts.json") as f:
             mock_data = f.read()
@@ -223,9 +428,34 @@ class ApiV2TestCase(TestCase):
         self.assertEqual(res.items[0].label, "Noisia")
         self.assertEqual(res.items[1].label, "NOISIA")
 
-    @mock.patch("requests.get")
-    def test_fetch_client_id(self, mock_method):
-        mock_method.side_effect = self._side_effect_request_get
+    def test_client_id_fetched_once_by_concurrent_requests(self):
+        cached = {}
+        self.api.cache.get.side_effect = cached.get
+        self.api.cache.add.side_effect = lambda key, value, *args: cached.update({key: value})
+        self.api.fetch_client_id = Mock(side_effect=lambda: time.sleep(0.05) or "abc")
+        self.api.settings.get = Mock(return_value="")
+
+        threads = [threading.Thread(target=lambda: self.api.api_client_id) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.api.fetch_client_id.assert_called_once()
+
+    def test_call_caches_pages_only_with_prefetching(self):
+        self.api._do_request = Mock(return_value={"collection": []})
+        self.api.call("/users/1/likes?limit=20")
+        self.api._do_request.assert_called_with("/users/1/likes", {"limit": ["20"]}, 0)
+
+        settings = Settings(MagicMock(**{"get.side_effect": lambda x: "true"}))
+        self.api = ApiV2(settings, "en", MagicMock(), MagicMock(), MagicMock(), MagicMock())
+        self.api._do_request = Mock(return_value={"collection": []})
+        self.api.call("/users/1/likes?limit=20")
+        self.api._do_request.assert_called_with("/users/1/likes", {"limit": ["20"]}, 10)
+
+    def test_fetch_client_id(self):
+        self.api.http.get.side_effect = self._side_effect_request_get
 
         client_id = self.api.fetch_client_id()
         self.assertEqual(client_id, "1XduoqV99lROqCMpijtDo5WnJmpaLuYm")
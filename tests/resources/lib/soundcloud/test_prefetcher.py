@@ -0,0 +1,33 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+from resources.lib.soundcloud.api_collection import ApiCollection
+from resources.lib.soundcloud.prefetcher import Prefetcher
+
+
+class PrefetcherTestCase(TestCase):
+    def setUp(self):
+        self.api = MagicMock()
+        self.api.prefetch.side_effect = self._side_effect_prefetch
+
+    @staticmethod
+    def _side_effect_prefetch(url):
+        collection = ApiCollection()
+        collection.next_href = url + "+"
+        return collection, 100
+
+    def test_depth(self):
+        Prefetcher(self.api, MagicMock(), depth=3, max_bytes=1000).start("/page").join()
+
+        self.assertEqual(self.api.prefetch.call_count, 3)
+        self.api.prefetch.assert_called_with("/page++")
+
+    def test_max_bytes(self):
+        Prefetcher(self.api, MagicMock(), depth=3, max_bytes=150).start("/page").join()
+
+        self.assertEqual(self.api.prefetch.call_count, 2)
+
+    def test_nothing_to_prefetch(self):
+        thread = Prefetcher(self.api, MagicMock(), depth=3, max_bytes=150).start(None)
+
+        self.assertIsNone(thread)
+        self.api.prefetch.assert_not_called()
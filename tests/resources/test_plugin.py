@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Runs the root menu route in a fresh interpreter and prints the modules it imported.
+# The snapshot is taken first and the Kodi modules are plain stubs, so no test helper
+# (e.g. unittest.mock, which loads json, threading and socket) hides an import.
+IMPORTS_SCRIPT = """
+import sys
+before = set(sys.modules)
+import types
+
+
+class Value(str):
+    def __getattr__(self, name):
+        return Value()
+
+    def __call__(self, *args, **kwargs):
+        return Value()
+
+
+class Stub(types.ModuleType):
+    def __getattr__(self, name):
+        return Value()
+
+
+for module in KODI_MODULES:
+    sys.modules[module] = Stub(module)
+sys.argv = ["plugin://plugin.audio.soundcloud/", "1", ""]
+from resources import plugin
+plugin.run()
+imported = sorted(set(sys.modules) - before - set(KODI_MODULES))
+import json
+print(json.dumps(imported))
+"""
+KODI_MODULES = ["xbmc", "xbmcaddon", "xbmcgui", "xbmcplugin", "xbmcvfs"]
+
+
+class PluginImportsTestCase(TestCase):
+    budget = 45  # Modules the root menu may import
+    heavy_modules = (
+        "requests",
+        "urllib3",
+        "sqlite3",
+        "hashlib",
+        "socket",
+        "zlib",
+        "concurrent.futures",
+        "resources.lib.adapters.http.requests_adapter",
+        "resources.lib.soundcloud.api_v2",
+    )
+
+    def test_root_menu_imports(self):
+        script = f"KODI_MODULES = {KODI_MODULES!r}\n" + IMPORTS_SCRIPT
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, capture_output=True, check=True
+        ).stdout
+        modules = json.loads(output)
+
+        for heavy_module in self.heavy_modules:
+            self.assertNotIn(heavy_module, modules)
+        self.assertLessEqual(len(modules), self.budget, modules)
+
+
+class PluginPlayTestCase(TestCase):
+    def setUp(self):
+        for module in ["xbmc", "xbmcaddon", "xbmcgui", "xbmcplugin", "xbmcvfs"]:
+            sys.modules[module] = MagicMock()
+        from resources import plugin
+        from resources.lib.kodi.container import Container
+        self.plugin = plugin
+        self.plugin.container = Container()
+        # Services are cached properties, so they can be replaced on the instance
+        for service in ("api", "factory", "platform"):
+            self.plugin.container.__dict__[service] = MagicMock()
+
+    def test_enqueue_resolves_first_track_only(self):
+        collection = [(f"plugin://play/?media_url={i}", MagicMock(), False) for i in range(100)]
+        collection.append(("plugin://?action=call", MagicMock(), True))
+        platform = self.plugin.container.platform
+
+        self.plugin.enqueue(1, collection, platform)
+
+        self.plugin.container.api.resolve_media_url.assert_called_once()
+        platform.set_resolved_url.assert_called_once_with(1, succeeded=True, listitem=collection[0][1])
+        self.assertEqual(platform.create_music_playlist.return_value.add.call_count, 100)